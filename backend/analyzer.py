@@ -16,10 +16,58 @@ Philosophy:
 import json
 import re
 import os
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Set, Tuple
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from decimal import Decimal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from google.cloud import storage
 
+# Encoders for the few non-JSON types that can reach a serializer, keyed by
+# exact type so the fallback is one dict probe; anything else becomes str
+_JSON_DEFAULTS = {
+    set: list,
+    frozenset: list,
+    Decimal: str,
+    bytes: lambda b: b.decode("utf-8", "replace"),
+}
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for values the JSON backend cannot serialize natively."""
+    return _JSON_DEFAULTS.get(type(obj), str)(obj)
+
+
+# Prefer orjson (Rust parser/serializer, works directly on bytes), then
+# ujson, then the stdlib. _dumps always returns UTF-8 bytes.
+try:
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+except ImportError:
+    try:
+        import ujson
+        _loads = ujson.loads
+        
+        def _dumps(obj: Any) -> bytes:
+            return ujson.dumps(obj, default=_json_default, ensure_ascii=False).encode()
+    except ImportError:
+        _loads = json.loads
+        
+        def _dumps(obj: Any) -> bytes:
+            return json.dumps(obj, default=_json_default).encode()
+
 # Try to load plugin system, fall back to legacy dictionary
 try:
     from plugin_loader import (
@@ -38,20 +86,173 @@ except ImportError:
     USE_PLUGINS = False
     print("Using legacy betfair_dictionary (plugin_loader not available)")
 
+# Field lookups repeat for every occurrence of a key but only a few hundred
+# known (key, context) pairs exist, so resolve each pair once. The bound leaves
+# room for datasets with many undocumented keys. Category lookups are cached
+# the same way. Cached dicts are shared between callers and must be treated
+# as read-only.
+_cached_field_info = lru_cache(maxsize=16384)(get_field_info)
+
+# Uniform (key, plugin_id, context) lookup so callers need no USE_PLUGINS branch
+if USE_PLUGINS:
+    _field_info = _cached_field_info
+    _cached_category_info = lru_cache(maxsize=256)(get_category_info)
+else:
+    def _field_info(key: str, plugin_id: str, context: str = None) -> Dict:
+        return _cached_field_info(key, context)
+
+
+def clear_lookup_caches():
+    """Forget memoized field/category lookups (call after plugins are reloaded)."""
+    _cached_field_info.cache_clear()
+    if USE_PLUGINS:
+        _cached_category_info.cache_clear()
+
+
 # Active plugin ID (can be overridden)
 ACTIVE_PLUGIN = os.environ.get("CHIMERA_PLUGIN", "betfair")
 
+# Regexes used per blob / per schema field, compiled once
+SHARD_PATTERN = re.compile(r'-\d{5}-of-\d{5}')
+# Runs of characters outside [A-Za-z0-9] (path separators, underscores and
+# anything BigQuery rejects in a column name), each collapsed to one underscore
+BQ_SEPARATOR_RUN_PATTERN = re.compile(r'[^0-9A-Za-z]+')
+
+# URL prefixes accepted by parse_gcs_url, followed by "bucket/prefix"
+GCS_URL_PREFIXES = (
+    "gs://",
+    "https://storage.googleapis.com/",
+    "https://storage.cloud.google.com/",
+)
+
+# Keys whose children are resolved against a specific field context
+CONTEXT_KEYS = {
+    'mc': 'mc',
+    'rc': 'rc',
+    'marketDefinition': 'marketDefinition',
+    'runners': 'runners',
+    'oc': 'oc',
+    'uo': 'uo',
+}
+
+# One bit per context, so each field's contexts are a small-int mask
+CONTEXT_BITS = {name: 1 << i for i, name in enumerate(dict.fromkeys(CONTEXT_KEYS.values()))}
+
+# Fields whose value distributions are reported in Phase 4
+CATEGORICAL_FIELDS = frozenset({
+    "op", "status", "marketType", "bettingType", "countryCode",
+    "venue", "ct", "inPlay", "complete", "side",
+})
+
+# Number of leading records sampled for categorical distributions
+CATEGORICAL_SAMPLE_SIZE = 10000
+
+# Runner-change keys that mark a record as carrying price data
+PRICE_KEYS = ("ltp", "batb", "batl", "trd")
+
+# Number of sample values kept per field path
+SAMPLE_VALUE_LIMIT = 5
+
+# Number of leading records searched for example records
+EXAMPLE_SCAN_LIMIT = 1000
+
+# Read size used when streaming NDJSON blobs from GCS
+BLOB_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Number of blobs downloaded and parsed concurrently (I/O-bound, so this can
+# exceed the core count; raise it for buckets with many small shards)
+LOAD_WORKERS = max(1, int(os.environ.get("CHIMERA_LOAD_WORKERS", "32")))
+
+# String values up to this length are interned when records are held in memory
+INTERN_MAX_LEN = 32
+
+# Minimum seconds between load progress messages
+PROGRESS_INTERVAL = 1.0
+
+# Start method for sharded Phase 1 worker processes. Forking a process that
+# already holds GCS client threads and sockets is unsafe, so spawn fresh ones.
+SHARD_MP_CONTEXT = "spawn"
+
+# Field type strings for JSON scalar/container values
+_TYPE_NAME = {
+    dict: "dict",
+    list: "list",
+    str: "str",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    type(None): "NoneType",
+}
+
+# Field type strings for non-empty lists, keyed on the first item's type
+_LIST_TYPE_STR = {
+    dict: "array[object]",
+    list: "array[array]",
+    int: "array[int]",
+    float: "array[float]",
+    str: "array[str]",
+    bool: "array[bool]",
+    type(None): "array[NoneType]",
+}
+
 
 def load_records_from_gcs(bucket_url: str) -> List[dict]:
     """
     Load all NDJSON records from a GCS bucket path.
     
+    Prefer iter_records_from_gcs when the records only need one pass; this
+    keeps every record in memory. Keys and short string values are interned
+    so the many repeated ones ("op", "mc", "ACTIVE", ...) share one object.
+    
     Args:
         bucket_url: GCS path (e.g., gs://bucket-name/prefix/)
     
     Returns:
         List of parsed JSON records (raw, unmodified)
     """
+    records = [_intern_strings(record) for record in iter_records_from_gcs(bucket_url)]
+    print(f"Total records loaded: {len(records):,}")
+    return records
+
+
+def _intern_strings(obj: Any) -> Any:
+    """Return obj with dict keys and short string values interned."""
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {sys.intern(k): _intern_strings(v) for k, v in obj.items()}
+    if obj_type is list:
+        return [_intern_strings(v) for v in obj]
+    if obj_type is str and len(obj) <= INTERN_MAX_LEN:
+        return sys.intern(obj)
+    return obj
+
+
+def iter_records_from_gcs(bucket_url: str) -> Iterator[dict]:
+    """
+    Stream NDJSON records from a GCS bucket path, in blob-name order.
+    
+    Only a bounded window of blobs is downloaded ahead of the consumer, so
+    memory is proportional to LOAD_WORKERS blobs rather than the dataset.
+    
+    Args:
+        bucket_url: GCS path (e.g., gs://bucket-name/prefix/)
+    
+    Yields:
+        Parsed JSON records (raw, unmodified)
+    """
+    return iter_blob_records(list_data_blobs(bucket_url))
+
+
+def list_data_blobs(bucket_url: str) -> list:
+    """
+    List the NDJSON data blobs under a GCS bucket path, sorted by name.
+    
+    Args:
+        bucket_url: GCS path (e.g., gs://bucket-name/prefix/)
+    
+    Returns:
+        List of storage.Blob objects
+    """
     bucket_name, prefix = parse_gcs_url(bucket_url)
     
     print(f"Connecting to GCS bucket: {bucket_name}, prefix: {prefix}")
@@ -63,11 +264,10 @@ def load_records_from_gcs(bucket_url: str) -> List[dict]:
     blobs = list(bucket.list_blobs(prefix=prefix))
     
     # Filter to data files (be very permissive)
-    shard_pattern = re.compile(r'-\d{5}-of-\d{5}')
     data_blobs = [b for b in blobs if b.size > 0 and (
         b.name.endswith(('.ndjson', '.json', '.jsonl')) or
         '.ndjson' in b.name.lower() or
-        shard_pattern.search(b.name) or
+        SHARD_PATTERN.search(b.name) or
         b.content_type in ('application/json', 'application/x-ndjson', 'text/plain')
     )]
     data_blobs.sort(key=lambda b: b.name)
@@ -76,67 +276,163 @@ def load_records_from_gcs(bucket_url: str) -> List[dict]:
         raise ValueError(f"No NDJSON files found at {bucket_url}")
     
     print(f"Found {len(data_blobs)} data files")
+    return data_blobs
+
+
+def iter_blob_records(data_blobs: list) -> Iterator[dict]:
+    """
+    Stream NDJSON records from a list of blobs, in list order.
     
-    # Load all records RAW - no processing
-    records = []
-    total_size = sum(b.size for b in data_blobs)
-    loaded_size = 0
+    Args:
+        data_blobs: storage.Blob objects to read
     
-    for i, blob in enumerate(data_blobs):
-        print(f"Loading file {i+1}/{len(data_blobs)}: {blob.name.split('/')[-1]}")
-        
-        content = blob.download_as_text()
-        lines = content.strip().split('\n')
+    Yields:
+        Parsed JSON records (raw, unmodified)
+    """
+    if not data_blobs:
+        return
+    
+    # Load records RAW - no processing. Downloads are network-bound and
+    # release the GIL, so keep several blobs in flight and hand them to the
+    # consumer in order as each one completes.
+    loaded_records = 0
+    total_files = len(data_blobs)
+    last_report = time.monotonic()
+    workers = min(LOAD_WORKERS, total_files)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        remaining = iter(data_blobs)
+        in_flight = deque(
+            (blob, executor.submit(load_blob_records, blob))
+            for blob in islice(remaining, workers)
+        )
         
-        for line in lines:
-            if line.strip():
+        for i in range(total_files):
+            blob, future = in_flight.popleft()
+            blob_records = future.result()
+            
+            next_blob = next(remaining, None)
+            if next_blob is not None:
+                in_flight.append((next_blob, executor.submit(load_blob_records, next_blob)))
+            
+            loaded_records += len(blob_records)
+            
+            # Report at most once per PROGRESS_INTERVAL (and on the last file);
+            # printing per blob dominates on many-small-file ingests
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL or i + 1 == total_files:
+                last_report = now
+                progress = int(((i + 1) / total_files) * 100)
+                print(f"Progress: {progress}% - Loaded {i+1}/{total_files} files, {loaded_records:,} records")
+            
+            yield from blob_records
+
+
+def load_blob_records(blob) -> List[dict]:
+    """Download and parse a single NDJSON blob, skipping malformed lines."""
+    records = []
+    
+    # Stream the blob so peak memory stays at one buffered chunk
+    with blob.open("rb", chunk_size=BLOB_CHUNK_SIZE) as fh:
+        for line in fh:
+            # Whitespace-only lines fail to parse and are skipped below, so
+            # only the common bare newline needs a cheap up-front check
+            if line != b"\n":
                 try:
-                    record = json.loads(line)
-                    records.append(record)
-                except json.JSONDecodeError:
+                    records.append(_loads(line))
+                except ValueError:
                     continue
-        
-        loaded_size += blob.size
-        progress = int((loaded_size / total_size) * 100)
-        print(f"Progress: {progress}% - Loaded {len(records):,} records")
     
-    print(f"Total records loaded: {len(records):,}")
     return records
 
 
 def parse_gcs_url(url: str) -> Tuple[str, str]:
     """Parse GCS URL into bucket name and prefix."""
-    gs_match = re.match(r'gs://([^/]+)/?(.*)', url)
-    if gs_match:
-        return gs_match.group(1), gs_match.group(2).rstrip('/')
-    
-    https_match = re.match(r'https://storage\.(?:googleapis|cloud\.google)\.com/([^/]+)/?(.*)', url)
-    if https_match:
-        return https_match.group(1), https_match.group(2).rstrip('/')
+    # Plain prefix/partition parsing: object names may contain '?' or '#',
+    # which a generic URL parser would split off as query/fragment
+    for url_prefix in GCS_URL_PREFIXES:
+        if url.startswith(url_prefix):
+            bucket, _, prefix = url[len(url_prefix):].partition('/')
+            if bucket:
+                return bucket, prefix.rstrip('/')
+            break
     
     raise ValueError(f"Invalid GCS URL format: {url}")
 
 
-def discover_fields_recursive(
-    obj: Any,
-    path: str = "",
+class _FieldRec:
+    """Per-path accumulator used during field discovery."""
+    
+    __slots__ = (
+        "path", "key", "name", "description", "category", "ml_relevance",
+        "type", "count", "sample_values", "contexts", "last_context",
+        "parent", "depth", "is_toplevel", "children", "item_children",
+    )
+    
+    def __init__(self, path: str, key: str, field_info: Dict, value_type: str, parent: str = ""):
+        self.path = path
+        self.key = key
+        # Structure facts for Phase 3, computed once per path
+        self.parent = parent
+        self.depth = path.count(".") + 1
+        self.is_toplevel = self.depth == 1 and "[" not in path
+        self.name = field_info.get("name", key)
+        self.description = field_info.get("description", "")
+        self.category = field_info.get("category", "Unknown")
+        self.ml_relevance = field_info.get("ml_relevance", "unknown")
+        self.type = value_type
+        self.count = 0
+        self.sample_values = []
+        self.contexts = 0  # CONTEXT_BITS mask
+        self.last_context = None
+        # Walk cache: child key -> _FieldRec for dict values, and per sampled
+        # list index a (child map, item path) pair for list values
+        self.children = {}
+        self.item_children = []
+    
+    def to_dict(self) -> Dict:
+        """Convert to the JSON-serializable field entry used in results."""
+        return {
+            "path": self.path,
+            "key": self.key,
+            "name": self.name,
+            "description": self.description,
+            "category": self.category,
+            "ml_relevance": self.ml_relevance,
+            "type": self.type,
+            "count": self.count,
+            "sample_values": self.sample_values,
+            "contexts": [name for name, bit in CONTEXT_BITS.items() if self.contexts & bit],
+        }
+
+
+def discover_fields(
+    record: Any,
     field_registry: Dict = None,
-    depth: int = 0,
     max_depth: int = 10,
-    context: str = None,
-    plugin_id: str = None
+    plugin_id: str = None,
+    value_counts: Dict = None,
+    root_children: Dict = None,
 ) -> Dict:
     """
-    Recursively discover all fields in a nested structure.
+    Discover all fields in a nested structure.
+    
+    Walks the record depth-first with an explicit stack rather than
+    recursion, so deep market structures cost no Python call frames.
+    
+    Each field record caches its children by key, so once a structure has
+    been seen the walk follows those links instead of building and hashing
+    a fresh path string for every key of every record.
     
     Args:
-        obj: The object to analyze
-        path: Current path (e.g., "mc.marketDefinition.venue")
-        field_registry: Accumulator for discovered fields
-        depth: Current recursion depth
-        max_depth: Maximum recursion depth
-        context: Context hint for field lookup (e.g., 'rc', 'marketDefinition')
+        record: The object to analyze
+        field_registry: Accumulator of path -> _FieldRec
+        max_depth: Maximum nesting depth to descend into
         plugin_id: Plugin to use for field definitions
+        value_counts: Optional path -> value -> count accumulator; when given,
+            scalar values of CATEGORICAL_FIELDS are tallied into it
+        root_children: Top-level key -> _FieldRec map to reuse across calls
+            with the same field_registry
     
     Returns:
         Updated field registry
@@ -144,123 +440,331 @@ def discover_fields_recursive(
     if field_registry is None:
         field_registry = {}
     
-    if depth > max_depth:
-        return field_registry
-    
     if plugin_id is None:
         plugin_id = ACTIVE_PLUGIN
     
-    if isinstance(obj, dict):
+    if root_children is None:
+        root_children = {}
+    
+    context_keys = CONTEXT_KEYS
+    context_bits = CONTEXT_BITS
+    field_info_lookup = _field_info
+    registry_get = field_registry.get
+    categorical_fields = CATEGORICAL_FIELDS
+    
+    if not isinstance(record, dict):
+        return field_registry
+    
+    # Each entry: (dict, child map, path, context, depth). Only dicts are
+    # ever queued, so flat records and scalar leaves never re-enter the loop.
+    stack = [(record, root_children, "", None, 0)]
+    
+    while stack:
+        obj, children, path, context, depth = stack.pop()
+        
         for key, value in obj.items():
-            field_path = f"{path}.{key}" if path else key
+            # JSON only yields exact dict/list types, so identity checks suffice
+            vt = type(value)
             
             # Determine context for child fields
-            child_context = context
-            if key == 'mc':
-                child_context = 'mc'
-            elif key == 'rc':
-                child_context = 'rc'
-            elif key == 'marketDefinition':
-                child_context = 'marketDefinition'
-            elif key == 'runners':
-                child_context = 'runners'
-            elif key == 'oc':
-                child_context = 'oc'
-            elif key == 'uo':
-                child_context = 'uo'
-            
-            # Get field info from plugin
-            if USE_PLUGINS:
-                field_info = get_field_info(key, plugin_id, child_context)
-            else:
-                field_info = get_field_info(key, child_context)
-            
-            # Determine value type
-            value_type = type(value).__name__
-            if isinstance(value, list) and len(value) > 0:
-                first_item = value[0]
-                if isinstance(first_item, dict):
-                    value_type = "array[object]"
-                elif isinstance(first_item, list):
-                    value_type = "array[array]"
-                else:
-                    value_type = f"array[{type(first_item).__name__}]"
+            child_context = context_keys.get(key, context)
             
-            # Register field
-            if field_path not in field_registry:
-                field_registry[field_path] = {
-                    "path": field_path,
-                    "key": key,
-                    "name": field_info.get("name", key),
-                    "description": field_info.get("description", ""),
-                    "category": field_info.get("category", "Unknown"),
-                    "ml_relevance": field_info.get("ml_relevance", "unknown"),
-                    "type": value_type,
-                    "count": 0,
-                    "sample_values": [],
-                    "contexts": set(),
-                }
+            rec = children.get(key)
+            if rec is None:
+                field_path = f"{path}.{key}" if path else key
+                
+                # Register field (field info is only resolved on first sight)
+                rec = registry_get(field_path)
+                if rec is None:
+                    field_info = field_info_lookup(key, plugin_id, child_context)
+                    
+                    # Determine value type
+                    if vt is list and value:
+                        first_cls = type(value[0])
+                        value_type = _LIST_TYPE_STR.get(first_cls) or f"array[{first_cls.__name__}]"
+                    else:
+                        value_type = _TYPE_NAME.get(vt) or vt.__name__
+                    
+                    rec = field_registry[field_path] = _FieldRec(field_path, key, field_info, value_type, path)
+                
+                children[key] = rec
             
-            field_registry[field_path]["count"] += 1
-            if context:
-                field_registry[field_path]["contexts"].add(context)
+            rec.count += 1
+            # Contexts are the interned CONTEXT_KEYS values, so an identity
+            # check skips the mask update on the common repeat-context path
+            if context is not rec.last_context and context:
+                rec.contexts |= context_bits[context]
+                rec.last_context = context
             
             # Collect sample values (limit to 5)
-            if len(field_registry[field_path]["sample_values"]) < 5:
-                if not isinstance(value, (dict, list)) or (isinstance(value, list) and len(value) < 10):
-                    sample = value
-                    if isinstance(value, list) and len(value) > 0:
-                        sample = value[:3]  # Truncate arrays
-                    field_registry[field_path]["sample_values"].append(sample)
+            samples = rec.sample_values
+            if len(samples) < SAMPLE_VALUE_LIMIT:
+                if vt is list:
+                    if len(value) < 10:
+                        samples.append(value[:3])  # Truncate arrays
+                elif vt is not dict:
+                    samples.append(value)
+            
+            # Tally categorical values while we are already here
+            if value_counts is not None and key in categorical_fields:
+                if value is not None and vt is not dict and vt is not list:
+                    value_counts[rec.path][str(value)] += 1
             
-            # Recurse into nested structures
-            if isinstance(value, dict):
-                discover_fields_recursive(value, field_path, field_registry, depth + 1, max_depth, child_context, plugin_id)
-            elif isinstance(value, list):
+            # Queue nested structures instead of recursing
+            if depth >= max_depth:
+                continue
+            if vt is dict:
+                stack.append((value, rec.children, rec.path, child_context, depth + 1))
+            elif vt is list:
                 # Sample first few items of arrays
+                item_children = rec.item_children
                 for i, item in enumerate(value[:3]):
-                    if isinstance(item, dict):
-                        item_path = f"{field_path}[{i}]"
-                        discover_fields_recursive(item, item_path, field_registry, depth + 1, max_depth, child_context, plugin_id)
+                    if type(item) is dict:
+                        if i >= len(item_children):
+                            item_children.extend(
+                                ({}, f"{rec.path}[{j}]") for j in range(len(item_children), i + 1)
+                            )
+                        item_map, item_path = item_children[i]
+                        stack.append((item, item_map, item_path, child_context, depth + 1))
     
     return field_registry
 
 
-def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str = None) -> Dict:
+class _Phase1Collector:
+    """
+    Phase 1 accumulators for one contiguous run of records.
+    
+    Single-process analysis feeds every record to one collector. Sharded
+    analysis runs one collector per contiguous blob range in a worker process
+    and merges them in blob order, which reproduces the single-pass result.
+    """
+    
+    def __init__(self, plugin_id: str, sharded: bool = False):
+        self.plugin_id = plugin_id
+        self.total_records = 0
+        self.field_registry = {}
+        self.root_children = {}
+        
+        # Categorical value counts (path -> value -> count), gathered in the
+        # same walk over the first CATEGORICAL_SAMPLE_SIZE records. A shard
+        # keeps one tally per record instead, because which of its records
+        # fall inside the sample is only known once earlier shards are merged.
+        self.categorical_counts = defaultdict(Counter)
+        self.categorical_records = [] if sharded else None
+        
+        # Example records (Phase 6) and the record index each was found at
+        self.examples = {}
+        self.example_indices = {}
+        
+        # Publish time (pt) range; only min, max and count are ever reported
+        self.ts_first = self.ts_last = None
+        self.ts_count = 0
+    
+    def add(self, record: dict):
+        """Run Phase 1 collection over the next record."""
+        i = self.total_records
+        self.total_records = i + 1
+        
+        # Capture example records as soon as each one turns up
+        examples = self.examples
+        if i < EXAMPLE_SCAN_LIMIT and len(examples) < len(EXAMPLE_PREDICATES):
+            for example_key, matches in EXAMPLE_PREDICATES:
+                if example_key not in examples and matches(record):
+                    examples[example_key] = record
+                    self.example_indices[example_key] = i
+        
+        pt = record.get("pt")
+        if pt:
+            if self.ts_count == 0:
+                self.ts_first = self.ts_last = pt
+            elif pt < self.ts_first:
+                self.ts_first = pt
+            elif pt > self.ts_last:
+                self.ts_last = pt
+            self.ts_count += 1
+        
+        if i >= CATEGORICAL_SAMPLE_SIZE:
+            value_counts = None
+        elif self.categorical_records is None:
+            value_counts = self.categorical_counts
+        else:
+            value_counts = defaultdict(Counter)
+            self.categorical_records.append(value_counts)
+        
+        discover_fields(
+            record,
+            self.field_registry,
+            plugin_id=self.plugin_id,
+            value_counts=value_counts,
+            root_children=self.root_children,
+        )
+    
+    def merge(self, other: "_Phase1Collector"):
+        """
+        Fold in a shard collector covering the records right after this one's.
+        
+        Args:
+            other: Collector built with sharded=True
+        """
+        offset = self.total_records
+        
+        for example_key, record in other.examples.items():
+            index = offset + other.example_indices[example_key]
+            if example_key not in self.examples and index < EXAMPLE_SCAN_LIMIT:
+                self.examples[example_key] = record
+                self.example_indices[example_key] = index
+        
+        if other.ts_count:
+            if self.ts_count == 0:
+                self.ts_first, self.ts_last = other.ts_first, other.ts_last
+            else:
+                self.ts_first = min(self.ts_first, other.ts_first)
+                self.ts_last = max(self.ts_last, other.ts_last)
+            self.ts_count += other.ts_count
+        
+        categorical_counts = self.categorical_counts
+        for record_counts in other.categorical_records[:max(CATEGORICAL_SAMPLE_SIZE - offset, 0)]:
+            for path, value_counts in record_counts.items():
+                categorical_counts[path].update(value_counts)
+        
+        registry = self.field_registry
+        for path, other_rec in other.field_registry.items():
+            rec = registry.get(path)
+            if rec is None:
+                # Walk-cache links point into the other shard's registry
+                other_rec.children = {}
+                other_rec.item_children = []
+                registry[path] = other_rec
+                continue
+            
+            rec.count += other_rec.count
+            room = SAMPLE_VALUE_LIMIT - len(rec.sample_values)
+            if room > 0:
+                rec.sample_values.extend(other_rec.sample_values[:room])
+            rec.contexts |= other_rec.contexts
+        
+        self.total_records += other.total_records
+
+
+def _collect_blob_shard(bucket_name: str, blob_names: List[str], plugin_id: str) -> _Phase1Collector:
+    """Run Phase 1 over a contiguous range of blobs (in a worker process)."""
+    bucket = storage.Client().bucket(bucket_name)
+    collector = _Phase1Collector(plugin_id, sharded=True)
+    for record in iter_blob_records([bucket.blob(name) for name in blob_names]):
+        collector.add(record)
+    return collector
+
+
+def _split_blob_ranges(data_blobs: list, shards: int) -> List[list]:
+    """Split blobs into at most `shards` contiguous ranges of similar total size."""
+    total_size = sum(b.size or 0 for b in data_blobs)
+    ranges = [[]]
+    cumulative = 0
+    
+    for blob in data_blobs:
+        if ranges[-1] and len(ranges) < shards and cumulative >= total_size * len(ranges) / shards:
+            ranges.append([])
+        ranges[-1].append(blob)
+        cumulative += blob.size or 0
+    
+    return ranges
+
+
+def _collect_sharded(bucket_url: str, plugin_id: str, workers: int) -> _Phase1Collector:
+    """Run Phase 1 across worker processes, one contiguous blob range each."""
+    bucket_name, _ = parse_gcs_url(bucket_url)
+    blob_ranges = _split_blob_ranges(list_data_blobs(bucket_url), workers)
+    
+    print(f"  Sharding {sum(map(len, blob_ranges))} files across {len(blob_ranges)} processes")
+    
+    collector = _Phase1Collector(plugin_id)
+    with ProcessPoolExecutor(
+        max_workers=len(blob_ranges),
+        mp_context=multiprocessing.get_context(SHARD_MP_CONTEXT),
+    ) as executor:
+        futures = [
+            executor.submit(_collect_blob_shard, bucket_name, [b.name for b in blobs], plugin_id)
+            for blobs in blob_ranges
+        ]
+        
+        # Merge strictly in blob order so results match a single pass
+        for n, future in enumerate(futures, 1):
+            collector.merge(future.result())
+            print(f"  Merged shard {n}/{len(futures)}, {collector.total_records:,} records so far")
+    
+    return collector
+
+
+def analyze_records(
+    bucket_url: str = None,
+    records: Iterable[dict] = None,
+    plugin_id: str = None,
+    workers: int = 1,
+) -> Dict:
     """
     Run complete dynamic analysis on NDJSON records.
     
     This function discovers ALL fields present without any hardcoded assumptions.
     Uses external plugin for field definitions and ML recommendations.
     
+    Records are consumed in a single pass, so when loading from GCS they are
+    streamed and never held in memory all at once. With workers > 1, field
+    discovery over a GCS path is sharded across processes by blob range.
+    
     Args:
         bucket_url: GCS path to load data from
-        records: Pre-loaded list of records
+        records: Pre-loaded records (any iterable, consumed once)
         plugin_id: Plugin to use for field definitions (default: ACTIVE_PLUGIN)
+        workers: Processes to use for Phase 1 when loading from bucket_url
     
     Returns:
         Comprehensive analysis results
     """
+    for _stage, results in analyze_records_iter(bucket_url, records, plugin_id, workers):
+        pass
+    return results
+
+
+def analyze_records_iter(
+    bucket_url: str = None,
+    records: Iterable[dict] = None,
+    plugin_id: str = None,
+    workers: int = 1,
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Run the analysis phase by phase, yielding each section as it is ready.
+    
+    Takes the same arguments as analyze_records. Each phase yields
+    (stage, {result_key: value}) with the result sections it produced; the
+    last item is ("complete", results) carrying the full results dict.
+    
+    Yields:
+        (stage name, partial results) tuples
+    """
     if plugin_id is None:
         plugin_id = ACTIVE_PLUGIN
     
-    # Load records if needed
+    # Stream records if needed (sharded loading happens in Phase 1)
+    shard_bucket = None
     if bucket_url and not records:
-        records = load_records_from_gcs(bucket_url)
+        if workers > 1:
+            shard_bucket = bucket_url
+        else:
+            records = iter_records_from_gcs(bucket_url)
     elif not records:
         records = []
     
-    print(f"Analyzing {len(records):,} records using plugin: {plugin_id}")
+    print(f"Analyzing records using plugin: {plugin_id}")
     
     # Load plugin for category info
     if USE_PLUGINS:
         plugin = load_plugin(plugin_id)
-        all_categories = get_all_categories(plugin_id)
+        all_categories = get_all_categories(plugin=plugin)
     else:
         all_categories = FIELD_CATEGORIES
     
     results = {
-        "total_records": len(records),
+        "total_records": 0,
         "plugin_id": plugin_id,
         "discovered_fields": [],
         "field_categories": {},
@@ -273,61 +777,73 @@ def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str
         "ml_suggestions": [],
     }
     
-    if not records:
-        return results
-    
     # ========================================================================
     # PHASE 1: DYNAMIC FIELD DISCOVERY
     # ========================================================================
     print("Phase 1: Discovering all fields...")
     
-    field_registry = {}
+    if shard_bucket:
+        collector = _collect_sharded(shard_bucket, plugin_id, workers)
+    else:
+        collector = _Phase1Collector(plugin_id)
+        for record in records:
+            collector.add(record)
+            
+            if collector.total_records % 10000 == 0:
+                print(f"  Scanned {collector.total_records:,} records, found {len(collector.field_registry)} unique field paths")
+    
+    field_registry = collector.field_registry
+    categorical_counts = collector.categorical_counts
+    ts_first, ts_last, ts_count = collector.ts_first, collector.ts_last, collector.ts_count
+    total_records = collector.total_records
+    results["examples"] = collector.examples
     
-    for i, record in enumerate(records):
-        discover_fields_recursive(record, "", field_registry, plugin_id=plugin_id)
-        
-        if (i + 1) % 10000 == 0:
-            print(f"  Scanned {i + 1:,} records, found {len(field_registry)} unique field paths")
+    print(f"  Discovered {len(field_registry)} unique field paths in {total_records:,} records")
     
-    print(f"  Discovered {len(field_registry)} unique field paths")
+    results["total_records"] = total_records
+    if not total_records:
+        yield "complete", results
+        return
     
-    # Convert sets to lists for JSON serialization
-    for field_data in field_registry.values():
-        field_data["contexts"] = list(field_data["contexts"])
+    field_recs = list(field_registry.values())
+    top_level_paths = {rec.path for rec in field_recs if rec.is_toplevel}
     
-    # Calculate presence percentages
-    for field_path, field_data in field_registry.items():
-        field_data["presence_pct"] = round((field_data["count"] / len(records)) * 100, 2)
+    # Sort by presence (most common first). Presence is monotonic in count,
+    # so sort the accumulators directly (two stable C-keyed sorts: path, then
+    # count descending) and only then build the JSON-serializable entries.
+    sorted_recs = sorted(field_recs, key=attrgetter("path"))
+    sorted_recs.sort(key=attrgetter("count"), reverse=True)
     
-    # Sort by presence (most common first)
-    sorted_fields = sorted(
-        field_registry.values(),
-        key=lambda x: (-x["presence_pct"], x["path"])
-    )
+    # Category membership (Phase 2) is resolved in the same pass
+    sorted_fields = []
+    categories = defaultdict(list)
+    for rec in sorted_recs:
+        field_data = rec.to_dict()
+        presence_pct = field_data["presence_pct"] = round((rec.count / total_records) * 100, 2)
+        sorted_fields.append(field_data)
+        
+        categories[rec.category].append({
+            "path": rec.path,
+            "key": rec.key,
+            "name": rec.name,
+            "type": rec.type,
+            "presence_pct": presence_pct,
+            "ml_relevance": rec.ml_relevance,
+        })
     
     results["discovered_fields"] = sorted_fields
+    yield "fields", {"discovered_fields": sorted_fields, "examples": results["examples"]}
     
     # ========================================================================
     # PHASE 2: CATEGORIZE FIELDS
     # ========================================================================
     print("Phase 2: Categorizing fields...")
     
-    categories = defaultdict(list)
-    for field_data in sorted_fields:
-        cat = field_data["category"]
-        categories[cat].append({
-            "path": field_data["path"],
-            "key": field_data["key"],
-            "name": field_data["name"],
-            "type": field_data["type"],
-            "presence_pct": field_data["presence_pct"],
-            "ml_relevance": field_data.get("ml_relevance", "unknown"),
-        })
-    
-    # Add category metadata from plugin
+    # Fields were grouped while building sorted_fields; add category
+    # metadata from plugin
     for cat_name, fields in categories.items():
         if USE_PLUGINS:
-            cat_info = get_category_info(cat_name, plugin_id)
+            cat_info = _cached_category_info(cat_name, plugin_id)
         else:
             cat_info = FIELD_CATEGORIES.get(cat_name, FIELD_CATEGORIES.get("Unknown", {
                 "icon": "❓",
@@ -342,6 +858,7 @@ def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str
             "field_count": len(fields),
             "fields": fields,
         }
+    yield "categories", {"field_categories": results["field_categories"]}
     
     # ========================================================================
     # PHASE 3: STRUCTURE ANALYSIS
@@ -349,136 +866,102 @@ def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str
     print("Phase 3: Analyzing data structure...")
     
     # Identify top-level structure
-    top_level_fields = [f for f in sorted_fields if "." not in f["path"] and "[" not in f["path"]]
+    top_level_fields = [f for f in sorted_fields if f["path"] in top_level_paths]
     
-    # Identify nested structures
-    nested_paths = set()
-    for f in sorted_fields:
-        parts = f["path"].split(".")
-        for i in range(1, len(parts)):
-            nested_paths.add(".".join(parts[:i]))
+    # Every nested structure is the parent path of some discovered field
+    nested_paths = {rec.parent for rec in field_recs if rec.parent}
     
     results["structure_analysis"] = {
         "top_level_fields": [f["key"] for f in top_level_fields],
         "nested_structures": list(nested_paths),
-        "max_depth": max(len(f["path"].split(".")) for f in sorted_fields) if sorted_fields else 0,
+        "max_depth": max(rec.depth for rec in field_recs) if field_recs else 0,
         "total_unique_paths": len(sorted_fields),
     }
+    yield "structure", {"structure_analysis": results["structure_analysis"]}
     
     # ========================================================================
     # PHASE 4: VALUE DISTRIBUTIONS
     # ========================================================================
     print("Phase 4: Computing value distributions...")
     
-    # Find categorical fields and compute distributions
-    categorical_candidates = [
-        "op", "status", "marketType", "bettingType", "countryCode",
-        "venue", "ct", "inPlay", "complete", "side"
-    ]
-    
-    for field_path in list(field_registry.keys()):
-        field_key = field_path.split(".")[-1].replace("[0]", "").replace("[1]", "").replace("[2]", "")
-        
-        if field_key in categorical_candidates:
-            # Collect values for this field
-            values = []
-            for record in records[:10000]:  # Sample for performance
-                value = get_nested_value(record, field_path)
-                if value is not None and not isinstance(value, (dict, list)):
-                    values.append(str(value))
+    # Values were counted during Phase 1; keep registry order for output
+    for rec in field_recs:
+        field_path = rec.path
+        value_counts = categorical_counts.get(field_path)
+        
+        if value_counts:
+            sample_size = value_counts.total()
             
-            if values:
-                # Count occurrences
-                value_counts = defaultdict(int)
-                for v in values:
-                    value_counts[v] += 1
-                
-                # Top 20 values
-                sorted_counts = sorted(value_counts.items(), key=lambda x: -x[1])[:20]
-                
-                results["value_distributions"][field_path] = {
-                    "field": field_path,
-                    "field_name": field_registry.get(field_path, {}).get("name", field_key),
-                    "unique_values": len(value_counts),
-                    "sample_size": len(values),
-                    "distribution": [
-                        {"value": v, "count": c, "pct": round((c / len(values)) * 100, 2)}
-                        for v, c in sorted_counts
-                    ]
-                }
+            # Top 20 values
+            sorted_counts = value_counts.most_common(20)
+            
+            results["value_distributions"][field_path] = {
+                "field": field_path,
+                "field_name": rec.name,
+                "unique_values": len(value_counts),
+                "sample_size": sample_size,
+                "distribution": [
+                    {"value": v, "count": c, "pct": round((c / sample_size) * 100, 2)}
+                    for v, c in sorted_counts
+                ]
+            }
+    
+    yield "distributions", {"value_distributions": results["value_distributions"]}
     
     # ========================================================================
     # PHASE 5: TEMPORAL ANALYSIS
     # ========================================================================
     print("Phase 5: Analyzing temporal patterns...")
     
-    # Find timestamp field (pt = publish time)
-    timestamps = []
-    for record in records:
-        pt = record.get("pt")
-        if pt:
-            timestamps.append(pt)
-    
-    if timestamps:
-        timestamps.sort()
+    # Publish times were reduced to min/max/count during Phase 1
+    if ts_count:
+        duration = ts_last - ts_first
         results["temporal_analysis"] = {
             "timestamp_field": "pt (Publish Time)",
-            "first_timestamp": timestamps[0],
-            "last_timestamp": timestamps[-1],
-            "duration_ms": timestamps[-1] - timestamps[0] if len(timestamps) > 1 else 0,
-            "duration_readable": format_duration(timestamps[-1] - timestamps[0]) if len(timestamps) > 1 else "N/A",
-            "total_timestamps": len(timestamps),
-            "avg_interval_ms": round((timestamps[-1] - timestamps[0]) / len(timestamps)) if len(timestamps) > 1 else 0,
+            "first_timestamp": ts_first,
+            "last_timestamp": ts_last,
+            "duration_ms": duration if ts_count > 1 else 0,
+            "duration_readable": format_duration(duration) if ts_count > 1 else "N/A",
+            "total_timestamps": ts_count,
+            "avg_interval_ms": round(duration / ts_count) if ts_count > 1 else 0,
         }
-    
-    # ========================================================================
-    # PHASE 6: EXAMPLE RECORDS
-    # ========================================================================
-    print("Phase 6: Collecting example records...")
-    
-    # First record
-    if records:
-        results["examples"]["first_record"] = records[0]
-    
-    # Record with marketDefinition
-    for record in records[:1000]:
-        mc = record.get("mc", [])
-        if mc and isinstance(mc, list):
-            for m in mc:
-                if isinstance(m, dict) and "marketDefinition" in m:
-                    results["examples"]["with_market_definition"] = record
-                    break
-        if "with_market_definition" in results["examples"]:
-            break
-    
-    # Record with price data (rc)
-    for record in records[:1000]:
-        mc = record.get("mc", [])
-        if mc and isinstance(mc, list):
-            for m in mc:
-                if isinstance(m, dict) and "rc" in m:
-                    rc = m["rc"]
-                    if rc and isinstance(rc, list) and len(rc) > 0:
-                        # Check for price fields
-                        for r in rc:
-                            if isinstance(r, dict) and any(k in r for k in ["ltp", "batb", "batl", "trd"]):
-                                results["examples"]["with_price_data"] = record
-                                break
-                if "with_price_data" in results["examples"]:
-                    break
-        if "with_price_data" in results["examples"]:
-            break
+    yield "temporal", {"temporal_analysis": results["temporal_analysis"]}
     
     # ========================================================================
     # PHASE 7: DATA QUALITY ASSESSMENT
     # ========================================================================
     print("Phase 7: Assessing data quality...")
     
-    # Calculate quality metrics
-    always_present = [f for f in sorted_fields if f["presence_pct"] == 100]
-    mostly_present = [f for f in sorted_fields if 95 <= f["presence_pct"] < 100]
-    sometimes_present = [f for f in sorted_fields if 50 <= f["presence_pct"] < 95]
-    rarely_present = [f for f in sorted_fields if f["presence_pct"] < 50]
+    # Calculate quality metrics and BigQuery schema suggestions (Phase 8) in
+    # one pass over the fields
+    always_present = []
+    mostly_present = []
+    sometimes_present = []
+    rarely_present = []
+    bq_schema = []
+    
+    for field_data in sorted_fields:
+        presence = field_data["presence_pct"]
+        if presence < 50:
+            rarely_present.append(field_data)
+            continue
+        
+        if presence == 100:
+            always_present.append(field_data)
+        elif presence >= 95:
+            mostly_present.append(field_data)
+        else:
+            sometimes_present.append(field_data)
+        
+        # Only commonly present fields are suggested, and only the top 50 kept
+        if len(bq_schema) < 50:
+            bq_schema.append({
+                "name": sanitize_bq_field_name(field_data["path"]),
+                "type": infer_bq_type(field_data["type"], field_data["sample_values"]),
+                "mode": "REQUIRED" if presence == 100 else "NULLABLE",
+                "description": field_data["description"],
+                "source_path": field_data["path"],
+            })
     
     results["data_quality"] = {
         "completeness": {
@@ -491,30 +974,19 @@ def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str
             "always_present_fields": [f["path"] for f in always_present],
             "rarely_present_fields": [f["path"] for f in rarely_present[:20]],  # Top 20
         },
-        "record_count": len(records),
+        "record_count": total_records,
         "unique_field_paths": len(sorted_fields),
     }
+    yield "quality", {"data_quality": results["data_quality"]}
     
     # ========================================================================
     # PHASE 8: SCHEMA RECOMMENDATIONS
     # ========================================================================
     print("Phase 8: Generating schema recommendations...")
     
-    # BigQuery schema suggestions
-    bq_schema = []
-    for field_data in sorted_fields:
-        if field_data["presence_pct"] >= 50:  # Only include commonly present fields
-            bq_type = infer_bq_type(field_data["type"], field_data["sample_values"])
-            bq_schema.append({
-                "name": sanitize_bq_field_name(field_data["path"]),
-                "type": bq_type,
-                "mode": "REQUIRED" if field_data["presence_pct"] == 100 else "NULLABLE",
-                "description": field_data["description"],
-                "source_path": field_data["path"],
-            })
-    
+    # Rows were built alongside the Phase 7 completeness buckets
     results["schema_recommendations"] = {
-        "bigquery_schema": bq_schema[:50],  # Top 50 fields
+        "bigquery_schema": bq_schema,  # Top 50 fields
         "notes": [
             "Schema based on fields present in ≥50% of records",
             "Nested fields flattened with underscore separators",
@@ -530,7 +1002,7 @@ def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str
     # Analyze what kind of data we have
     has_prices = any("ltp" in f["path"] or "batb" in f["path"] for f in sorted_fields)
     has_volume = any("tv" in f["path"] or "trd" in f["path"] for f in sorted_fields)
-    has_time_series = len(timestamps) > 100
+    has_time_series = ts_count > 100
     has_order_book = any("batb" in f["path"] or "batl" in f["path"] for f in sorted_fields)
     has_market_definition = any("marketDefinition" in f["path"] for f in sorted_fields)
     has_trd = any("trd" in f["path"] for f in sorted_fields)
@@ -660,27 +1132,48 @@ def analyze_records(bucket_url: str = None, records: List = None, plugin_id: str
             })
     
     results["ml_suggestions"] = suggestions
+    yield "ml", {
+        key: results[key]
+        for key in ("ml_suggestions", "derived_features", "data_profile")
+        if key in results
+    }
     
     print("Analysis complete!")
-    return results
+    yield "complete", results
 
 
 def get_nested_value(obj: dict, path: str) -> Any:
     """Get value from nested dict using dot notation path."""
-    parts = path.replace("[", ".").replace("]", "").split(".")
+    return _get_by_parts(obj, _split_path(path))
+
+
+@lru_cache(maxsize=4096)
+def _split_path(path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """
+    Compile a dot/bracket path (e.g. "mc[0].rc") once per path.
+    
+    Returns:
+        (key, index) pairs; index is the int form of numeric parts (else
+        None) so list steps need no int() parse per lookup
+    """
+    return tuple(
+        (p, int(p) if p.isdigit() else None)
+        for p in path.replace("[", ".").replace("]", "").split(".") if p
+    )
+
+
+def _get_by_parts(obj: dict, parts: Tuple[Tuple[str, Optional[int]], ...]) -> Any:
+    """Walk a nested structure along a compiled path."""
     current = obj
     
-    for part in parts:
-        if not part:
-            continue
-        if isinstance(current, dict):
-            current = current.get(part)
-        elif isinstance(current, list):
-            try:
-                idx = int(part)
-                current = current[idx] if idx < len(current) else None
-            except (ValueError, IndexError):
+    for key, index in parts:
+        current_type = type(current)
+        if current_type is dict:
+            current = current.get(key)
+        elif current_type is list:
+            if index is None or index >= len(current):
                 return None
+            current = current[index]
         else:
             return None
         
@@ -690,6 +1183,33 @@ def get_nested_value(obj: dict, path: str) -> Any:
     return current
 
 
+def _has_market_definition(record: dict) -> bool:
+    """True if any market change in the record carries a marketDefinition."""
+    mc = record.get("mc")
+    return type(mc) is list and any(
+        type(m) is dict and "marketDefinition" in m for m in mc
+    )
+
+
+def _has_price_data(record: dict) -> bool:
+    """True if any runner change in the record carries price fields."""
+    mc = record.get("mc")
+    return type(mc) is list and any(
+        type(r) is dict and any(k in r for k in PRICE_KEYS)
+        for m in mc
+        if type(m) is dict and type(m.get("rc")) is list
+        for r in m["rc"]
+    )
+
+
+# Example record slots and the predicate that selects each (first match wins)
+EXAMPLE_PREDICATES = (
+    ("first_record", lambda record: True),
+    ("with_market_definition", _has_market_definition),
+    ("with_price_data", _has_price_data),
+)
+
+
 def format_duration(ms: int) -> str:
     """Format milliseconds as human-readable duration."""
     seconds = ms // 1000
@@ -704,42 +1224,49 @@ def format_duration(ms: int) -> str:
         return f"{seconds}s"
 
 
+# BigQuery types keyed on the type strings produced during field discovery
+_BQ_TYPE_MAP = {
+    "int": "INT64",
+    "float": "FLOAT64",
+    "bool": "BOOL",
+    "str": "STRING",
+    "dict": "RECORD",
+    "NoneType": "STRING",
+}
+
+# Element types for "array[...]" fields
+_BQ_ARRAY_TYPE_MAP = {
+    "object": "RECORD",  # Needs struct definition
+    "array": "STRING",  # Serialize nested arrays
+    "int": "ARRAY<INT64>",
+    "float": "ARRAY<FLOAT64>",
+    "bool": "ARRAY<BOOL>",
+}
+
+
 def infer_bq_type(python_type: str, sample_values: list) -> str:
     """Infer BigQuery type from Python type and sample values."""
-    if "int" in python_type:
-        return "INT64"
-    elif "float" in python_type:
-        return "FLOAT64"
-    elif "bool" in python_type:
-        return "BOOL"
-    elif "array" in python_type:
-        if "object" in python_type:
-            return "RECORD"  # Needs struct definition
-        elif "array" in python_type:
-            return "STRING"  # Serialize nested arrays
-        else:
-            return "ARRAY<STRING>"
-    elif "dict" in python_type:
-        return "RECORD"
-    else:
-        # Check sample values
-        if sample_values:
-            first = sample_values[0]
-            if isinstance(first, bool):
-                return "BOOL"
-            elif isinstance(first, int):
-                return "INT64"
-            elif isinstance(first, float):
-                return "FLOAT64"
-        return "STRING"
+    bq_type = _BQ_TYPE_MAP.get(python_type)
+    if bq_type is not None:
+        if python_type == "NoneType" and sample_values:
+            # Field was null on first sight; fall back to the samples
+            for value in sample_values:
+                if value is not None:
+                    return _BQ_TYPE_MAP.get(type(value).__name__, "STRING")
+        return bq_type
+    
+    if python_type.startswith("array["):
+        return _BQ_ARRAY_TYPE_MAP.get(python_type[6:-1], "ARRAY<STRING>")
+    
+    return "STRING"
 
 
+@lru_cache(maxsize=8192)
 def sanitize_bq_field_name(path: str) -> str:
     """Convert field path to valid BigQuery column name."""
-    # Replace dots and brackets with underscores
-    name = re.sub(r'[\.\[\]]', '_', path)
-    # Remove consecutive underscores
-    name = re.sub(r'_+', '_', name)
+    # Replace separators and invalid characters with underscores, collapsing
+    # runs in one pass
+    name = BQ_SEPARATOR_RUN_PATTERN.sub('_', path)
     # Remove leading/trailing underscores
     name = name.strip('_')
     # Ensure starts with letter
@@ -748,20 +1275,35 @@ def sanitize_bq_field_name(path: str) -> str:
     return name[:128]  # BigQuery max column name length
 
 
-# Streaming helpers for progress updates
-def stream_progress(message: str, progress: int = None) -> str:
+# Streaming helpers for progress updates. Each returns the UTF-8 encoded
+# JSON payload; the transport writes the bytes as-is.
+# The stream messages have a fixed shape, so their envelopes are pre-encoded
+# and only the variable payload goes through the JSON encoder
+_PROGRESS_PREFIX = b'{"type":"progress","message":'
+_PROGRESS_FIELD = b',"progress":'
+_RESULT_PREFIX = b'{"type":"result","data":'
+_STAGE_PREFIX = b'{"type":"stage","stage":'
+_STAGE_DATA_FIELD = b',"data":'
+_ERROR_PREFIX = b'{"type":"error","message":'
+
+
+def stream_progress(message: str, progress: int = None) -> bytes:
     """Format a progress message for streaming."""
-    data = {"type": "progress", "message": message}
-    if progress is not None:
-        data["progress"] = progress
-    return json.dumps(data)
+    if progress is None:
+        return _PROGRESS_PREFIX + _dumps(message) + b"}"
+    return _PROGRESS_PREFIX + _dumps(message) + _PROGRESS_FIELD + _dumps(progress) + b"}"
 
 
-def stream_result(results: dict) -> str:
+def stream_result(results: dict) -> bytes:
     """Format final results for streaming."""
-    return json.dumps({"type": "result", "data": results}, default=str)
+    return _RESULT_PREFIX + _dumps(results) + b"}"
+
+
+def stream_stage(stage: str, data: dict) -> bytes:
+    """Format a partial result section for streaming."""
+    return _STAGE_PREFIX + _dumps(stage) + _STAGE_DATA_FIELD + _dumps(data) + b"}"
 
 
-def stream_error(error: str) -> str:
+def stream_error(error: str) -> bytes:
     """Format an error message for streaming."""
-    return json.dumps({"type": "error", "message": error})
+    return _ERROR_PREFIX + _dumps(error) + b"}"
@@ -2,32 +2,98 @@
 """
 Launches Cloud Batch jobs for heavy data processing
 """
-from google.cloud import batch_v1
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+from google.api_core import exceptions, retry, retry_async
+from google.auth.transport import requests as auth_requests
+from google.cloud import batch_v1, storage
+from google.oauth2 import id_token
 from google.protobuf.duration_pb2 import Duration
-import uuid
+import asyncio
+import orjson
+import time
+from secrets import token_hex
 import os
 
 PROJECT_ID = os.environ.get("GCP_PROJECT", "betfair-data-explorer")
 REGION = "us-central1"
 BATCH_PARENT = f"projects/{PROJECT_ID}/locations/{REGION}"
+_JOB_NAME_FMT = BATCH_PARENT + "/jobs/{}"
 
 CONTAINER_IMAGE = "gcr.io/betfair-data-explorer/chimera-worker:latest"
 
+# Manifests and worker results for API-launched jobs live under
+# gs://{RESULTS_BUCKET}/{job_id}/
+RESULTS_BUCKET = os.environ.get("CHIMERA_RESULTS_BUCKET", "betfair-chimera-results")
 
-def submit_batch_job(manifest_gcs_path: str) -> str:
-    """
-    Submit a Cloud Batch job to process NDJSON data.
+# Pub/Sub topic that receives job state changes (name or full topic path).
+# When set, jobs publish JOB_STATE_CHANGED events and a push subscription to
+# POST /batch/events lets status checks skip polling Batch.
+BATCH_EVENTS_TOPIC = os.environ.get("CHIMERA_BATCH_EVENTS_TOPIC", "")
+if BATCH_EVENTS_TOPIC and not BATCH_EVENTS_TOPIC.startswith("projects/"):
+    BATCH_EVENTS_TOPIC = f"projects/{PROJECT_ID}/topics/{BATCH_EVENTS_TOPIC}"
 
-    Args:
-        manifest_gcs_path: GCS path to the job manifest JSON
+# The push subscription must use an authenticated push identity: POST
+# /batch/events only accepts OIDC tokens issued for this audience (normally
+# the endpoint URL) to this service account. Events are refused while
+# either is unset.
+BATCH_EVENTS_AUDIENCE = os.environ.get("CHIMERA_BATCH_EVENTS_AUDIENCE", "")
+BATCH_EVENTS_SERVICE_ACCOUNT = os.environ.get("CHIMERA_BATCH_EVENTS_SERVICE_ACCOUNT", "")
 
-    Returns:
-        The batch job ID
-    """
-    client = batch_v1.BatchServiceClient()
+# Batch job IDs for API analyses are derived from the API job ID, so a job
+# state event can be traced back to its job
+_API_JOB_PREFIX = "chimera-"
+
+# Maximum create_job RPCs in flight from submit_batch_jobs
+MAX_CONCURRENT_SUBMITS = 16
+
+# Transient errors worth retrying with exponential backoff. Job IDs are
+# generated client-side, so a retried create can never start a second job.
+# Any other API error is reported as an unknown status by the getters.
+_RETRYABLE_ERRORS = (
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+)
+_RETRY_SETTINGS = dict(
+    predicate=retry.if_exception_type(*_RETRYABLE_ERRORS),
+    initial=1.0,
+    maximum=30.0,
+    multiplier=2.0,
+    timeout=120.0,
+)
+RPC_RETRY = retry.Retry(**_RETRY_SETTINGS)
+RPC_RETRY_ASYNC = retry_async.AsyncRetry(**_RETRY_SETTINGS)
+_API_ERRORS = (exceptions.GoogleAPICallError, exceptions.RetryError)
+
+
+# Batch job state -> simple status; anything else is still running
+_STATE_MAP = {
+    "SUCCEEDED": "complete",
+    "FAILED": "failed",
+    "DELETION_IN_PROGRESS": "failed",
+}
+
+# Terminal job states pushed via Pub/Sub (job ID -> state name), oldest
+# dropped first beyond PUSHED_STATES_SIZE
+PUSHED_STATES_SIZE = 4096
+_pushed_states: "OrderedDict[str, str]" = OrderedDict()
+
+# Seconds a fetched job status is reused, so concurrent pollers share one RPC
+STATUS_CACHE_TTL = 1.0
+_status_cache: Dict[str, tuple] = {}
+
+
+@lru_cache(maxsize=1)
+def get_batch_client() -> batch_v1.BatchServiceClient:
+    """Return the process-wide Batch client (created on first use)."""
+    return batch_v1.BatchServiceClient()
 
-    job_id = f"chimera-{uuid.uuid4().hex[:12]}"
 
+def _build_job_template() -> batch_v1.Job:
+    """Build the static part of the analysis job definition (once, at import)."""
     runnable = batch_v1.Runnable(
         container=batch_v1.Runnable.Container(
             image_uri=CONTAINER_IMAGE,
@@ -35,7 +101,7 @@ def submit_batch_job(manifest_gcs_path: str) -> str:
                 "python",
                 "worker.py",
                 "--manifest",
-                manifest_gcs_path
+                ""  # Manifest path, filled in per job
             ]
         )
     )
@@ -70,15 +136,141 @@ def submit_batch_job(manifest_gcs_path: str) -> str:
         )
     )
 
-    client.create_job(
-        parent=BATCH_PARENT,
-        job=job,
-        job_id=job_id
-    )
+    if BATCH_EVENTS_TOPIC:
+        job.notifications = [
+            batch_v1.JobNotification(
+                pubsub_topic=BATCH_EVENTS_TOPIC,
+                message=batch_v1.JobNotification.Message(
+                    type_=batch_v1.JobNotification.Type.JOB_STATE_CHANGED
+                )
+            )
+        ]
+
+    return job
+
+
+_JOB_TEMPLATE = _build_job_template()
+
+
+def build_job(manifest_gcs_path: str) -> batch_v1.Job:
+    """
+    Build the Batch job definition for one analysis manifest.
+
+    Clones the prebuilt template and patches in the manifest path, instead
+    of constructing the whole proto tree per submission.
+
+    Args:
+        manifest_gcs_path: GCS path to the job manifest JSON
+
+    Returns:
+        The Job proto, ready for create_job
+    """
+    job = batch_v1.Job()
+    batch_v1.Job.copy_from(job, _JOB_TEMPLATE)
+    job.task_groups[0].task_spec.runnables[0].container.commands[-1] = manifest_gcs_path
+    return job
+
+
+def submit_batch_job(manifest_gcs_path: str, job_id: Optional[str] = None) -> str:
+    """
+    Submit a Cloud Batch job to process NDJSON data.
+
+    Args:
+        manifest_gcs_path: GCS path to the job manifest JSON
+        job_id: Batch job ID to use (random if not given)
+
+    Returns:
+        The batch job ID
+    """
+    if job_id is None:
+        job_id = f"chimera-{token_hex(6)}"
+
+    try:
+        get_batch_client().create_job(
+            parent=BATCH_PARENT,
+            job=build_job(manifest_gcs_path),
+            job_id=job_id,
+            retry=RPC_RETRY,
+        )
+    except exceptions.AlreadyExists:
+        # An earlier attempt succeeded but its response was lost
+        pass
 
     return job_id
 
 
+@lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """Return the process-wide GCS client (created on first use)."""
+    return storage.Client()
+
+
+def launch_batch_job(job_id: str, bucket_url: str) -> str:
+    """
+    Write the manifest for an API analysis job and submit it to Cloud Batch.
+
+    The worker writes its result to gs://{RESULTS_BUCKET}/{job_id}/, where
+    the API's status endpoint looks for it.
+
+    Args:
+        job_id: API job ID
+        bucket_url: GCS path of the data to analyze
+
+    Returns:
+        The batch job ID
+    """
+    manifest = {
+        "job_id": job_id,
+        "bucket_url": bucket_url,
+        "output_prefix": f"gs://{RESULTS_BUCKET}/{job_id}/",
+    }
+    manifest_path = f"{job_id}/manifest.json"
+    get_storage_client().bucket(RESULTS_BUCKET).blob(manifest_path).upload_from_string(
+        orjson.dumps(manifest),
+        content_type="application/json"
+    )
+    return submit_batch_job(f"gs://{RESULTS_BUCKET}/{manifest_path}", _API_JOB_PREFIX + job_id)
+
+
+def api_job_id(batch_job_id: str) -> Optional[str]:
+    """Return the API job ID a Batch job was launched for by launch_batch_job, if any."""
+    if batch_job_id.startswith(_API_JOB_PREFIX + "job-"):
+        return batch_job_id[len(_API_JOB_PREFIX):]
+    return None
+
+
+async def submit_batch_jobs(manifest_gcs_paths: List[str]) -> List[str]:
+    """
+    Submit one Cloud Batch job per manifest, issuing the RPCs concurrently.
+
+    Args:
+        manifest_gcs_paths: GCS paths to job manifest JSONs
+
+    Returns:
+        The batch job IDs, in manifest order
+    """
+    # Async gRPC clients are bound to the running event loop, so one is
+    # shared per call rather than per process
+    client = batch_v1.BatchServiceAsyncClient()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUBMITS)
+
+    async def submit(manifest_gcs_path: str) -> str:
+        job_id = f"chimera-{token_hex(6)}"
+        async with semaphore:
+            try:
+                await client.create_job(
+                    parent=BATCH_PARENT,
+                    job=build_job(manifest_gcs_path),
+                    job_id=job_id,
+                    retry=RPC_RETRY_ASYNC,
+                )
+            except exceptions.AlreadyExists:
+                pass
+        return job_id
+
+    return list(await asyncio.gather(*(submit(path) for path in manifest_gcs_paths)))
+
+
 def get_job_status(job_id: str) -> dict:
     """
     Get the status of a Cloud Batch job.
@@ -89,21 +281,137 @@ def get_job_status(job_id: str) -> dict:
     Returns:
         Dict with status info
     """
-    client = batch_v1.BatchServiceClient()
-    job_name = f"{BATCH_PARENT}/jobs/{job_id}"
+    pushed_state = _pushed_states.get(job_id)
+    if pushed_state is not None:
+        return _status_from_state(pushed_state)
+
+    now = time.monotonic()
+    cached = _status_cache.get(job_id)
+    if cached and cached[0] > now:
+        return cached[1]
 
     try:
-        job = client.get_job(name=job_name)
+        job = get_batch_client().get_job(name=_JOB_NAME_FMT.format(job_id), retry=RPC_RETRY)
+    except _API_ERRORS as e:
+        # NotFound, PermissionDenied, or transient errors that outlasted retry
+        return {"status": "unknown", "error": str(e)}
 
-        # Map Batch job state to simple status
-        state = job.status.state.name
+    status = _status_from_state(job.status.state.name)
+    _status_cache[job_id] = (now + STATUS_CACHE_TTL, status)
+    return status
 
-        if state == "SUCCEEDED":
-            return {"status": "complete", "batch_status": state}
-        elif state in ("FAILED", "DELETION_IN_PROGRESS"):
-            return {"status": "failed", "batch_status": state}
+
+def get_job_statuses(job_ids: List[str]) -> Dict[str, dict]:
+    """
+    Get the status of many Cloud Batch jobs with a single list_jobs call.
+
+    Statuses are reused for STATUS_CACHE_TTL seconds, so several pollers
+    asking about the same jobs share one RPC.
+
+    Args:
+        job_ids: The batch job IDs
+
+    Returns:
+        Dict of job ID -> status info (same shape as get_job_status)
+    """
+    now = time.monotonic()
+    if len(_status_cache) > 1024:
+        for job_id in [j for j, (expires, _) in _status_cache.items() if expires <= now]:
+            del _status_cache[job_id]
+
+    statuses = {}
+    missing = []
+    for job_id in job_ids:
+        cached = _status_cache.get(job_id)
+        if job_id in _pushed_states:
+            statuses[job_id] = _status_from_state(_pushed_states[job_id])
+        elif cached and cached[0] > now:
+            statuses[job_id] = cached[1]
         else:
-            return {"status": "running", "batch_status": state}
+            missing.append(job_id)
 
-    except Exception as e:
-        return {"status": "unknown", "error": str(e)}
+    if not missing:
+        return statuses
+
+    names = {_JOB_NAME_FMT.format(job_id): job_id for job_id in missing}
+    job_filter = " OR ".join(f'name="{name}"' for name in names)
+
+    try:
+        for job in get_batch_client().list_jobs(parent=BATCH_PARENT, filter=job_filter, retry=RPC_RETRY):
+            job_id = names.get(job.name)
+            if job_id is not None:
+                status = _status_from_state(job.status.state.name)
+                statuses[job_id] = status
+                _status_cache[job_id] = (now + STATUS_CACHE_TTL, status)
+    except _API_ERRORS as e:
+        for job_id in missing:
+            statuses.setdefault(job_id, {"status": "unknown", "error": str(e)})
+        return statuses
+
+    for job_id in missing:
+        statuses.setdefault(job_id, {"status": "unknown", "error": "Job not found"})
+
+    return statuses
+
+
+@lru_cache(maxsize=1)
+def _get_auth_request() -> auth_requests.Request:
+    """Return the shared HTTP transport used to fetch Google's token certificates."""
+    return auth_requests.Request()
+
+
+def verify_push_token(token: str) -> bool:
+    """
+    Check the OIDC token Pub/Sub attached to a push delivery.
+
+    Blocks on a certificate fetch, so call it from a thread in async code.
+
+    Args:
+        token: Bearer token from the Authorization header
+
+    Returns:
+        True if it is a valid Google-signed token for BATCH_EVENTS_AUDIENCE
+        issued to BATCH_EVENTS_SERVICE_ACCOUNT
+    """
+    if not BATCH_EVENTS_AUDIENCE or not BATCH_EVENTS_SERVICE_ACCOUNT:
+        return False
+
+    try:
+        claims = id_token.verify_oauth2_token(token, _get_auth_request(), audience=BATCH_EVENTS_AUDIENCE)
+    except ValueError:
+        # Malformed, expired, wrong audience or issuer, bad signature
+        return False
+
+    return claims.get("email_verified") is True and claims.get("email") == BATCH_EVENTS_SERVICE_ACCOUNT
+
+
+def record_job_event(attributes: Dict[str, str]) -> Optional[str]:
+    """
+    Record a Batch JOB_STATE_CHANGED notification.
+
+    Terminal states are kept so get_job_status / get_job_statuses answer
+    without an RPC; other transitions are ignored.
+
+    Args:
+        attributes: Pub/Sub message attributes set by Batch
+
+    Returns:
+        The job ID if the job reached a terminal state, otherwise None
+    """
+    job_name = attributes.get("JobName")
+    state = attributes.get("NewJobState")
+    if attributes.get("Type") != "JOB_STATE_CHANGED" or not job_name or state not in _STATE_MAP:
+        return None
+
+    job_id = job_name.rsplit("/", 1)[-1]
+    _pushed_states[job_id] = state
+    _pushed_states.move_to_end(job_id)
+    while len(_pushed_states) > PUSHED_STATES_SIZE:
+        _pushed_states.popitem(last=False)
+    _status_cache.pop(job_id, None)
+    return job_id
+
+
+def _status_from_state(state: str) -> dict:
+    """Map a Batch job state name to the simple status dict."""
+    return {"status": _STATE_MAP.get(state, "running"), "batch_status": state}
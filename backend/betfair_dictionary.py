@@ -6,6 +6,9 @@ This dictionary is used to present data in a human-digestible format.
 
 Source: Betfair Exchange Stream API documentation
 """
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
 # Top-level message fields
 TOP_LEVEL_FIELDS = {
@@ -565,6 +568,46 @@ MATCHED_FIELDS = {
 }
 
 
+# Fallback lookups, most specific first; consulted after the context table
+_FALLBACK_LOOKUPS = (
+    RUNNER_CHANGE_FIELDS,
+    MARKET_DEFINITION_FIELDS,
+    RUNNER_DEFINITION_FIELDS,
+    MARKET_CHANGE_FIELDS,
+    ORDER_CHANGE_FIELDS,
+    UNMATCHED_ORDER_FIELDS,
+    MATCHED_FIELDS,
+    TOP_LEVEL_FIELDS,
+)
+
+# Context hint -> the table searched before the fallbacks
+_CONTEXT_LOOKUPS = {
+    'runner_change': RUNNER_CHANGE_FIELDS,
+    'rc': RUNNER_CHANGE_FIELDS,
+    'market_definition': MARKET_DEFINITION_FIELDS,
+    'marketDefinition': MARKET_DEFINITION_FIELDS,
+    'runner_definition': RUNNER_DEFINITION_FIELDS,
+    'market_change': MARKET_CHANGE_FIELDS,
+    'mc': MARKET_CHANGE_FIELDS,
+    'order': UNMATCHED_ORDER_FIELDS,
+    'uo': UNMATCHED_ORDER_FIELDS,
+    'order_change': ORDER_CHANGE_FIELDS,
+    'oc': ORDER_CHANGE_FIELDS,
+}
+
+# Flattened lookups built once at import: the fallback chain merged so the
+# first table containing a field wins, plus one merged table per context
+_DEFAULT_LOOKUP = {}
+for _lookup in reversed(_FALLBACK_LOOKUPS):
+    _DEFAULT_LOOKUP.update(_lookup)
+
+_FLAT_LOOKUPS = {
+    context: {**_DEFAULT_LOOKUP, **lookup}
+    for context, lookup in _CONTEXT_LOOKUPS.items()
+}
+del _lookup
+
+
 def get_field_info(field_name: str, context: str = None) -> dict:
     """
     Get human-readable information for a field.
@@ -574,42 +617,17 @@ def get_field_info(field_name: str, context: str = None) -> dict:
         context: Optional context hint ('market', 'runner', 'order')
     
     Returns:
-        Dictionary with name, description, category
+        Dictionary with name, description, category (shared; do not mutate)
     """
-    # Build combined lookup in order of specificity
-    lookups = []
-    
-    if context == 'runner_change' or context == 'rc':
-        lookups.append(RUNNER_CHANGE_FIELDS)
-    elif context == 'market_definition' or context == 'marketDefinition':
-        lookups.append(MARKET_DEFINITION_FIELDS)
-    elif context == 'runner_definition':
-        lookups.append(RUNNER_DEFINITION_FIELDS)
-    elif context == 'market_change' or context == 'mc':
-        lookups.append(MARKET_CHANGE_FIELDS)
-    elif context == 'order' or context == 'uo':
-        lookups.append(UNMATCHED_ORDER_FIELDS)
-    elif context == 'order_change' or context == 'oc':
-        lookups.append(ORDER_CHANGE_FIELDS)
-    
-    # Always include general lookups as fallback
-    lookups.extend([
-        RUNNER_CHANGE_FIELDS,
-        MARKET_DEFINITION_FIELDS,
-        RUNNER_DEFINITION_FIELDS,
-        MARKET_CHANGE_FIELDS,
-        ORDER_CHANGE_FIELDS,
-        UNMATCHED_ORDER_FIELDS,
-        MATCHED_FIELDS,
-        TOP_LEVEL_FIELDS,
-    ])
-    
-    # Search through lookups
-    for lookup in lookups:
-        if field_name in lookup:
-            return lookup[field_name]
-    
-    # Return default if not found
+    info = _FLAT_LOOKUPS.get(context, _DEFAULT_LOOKUP).get(field_name)
+    if info is None:
+        return _default_field_info(field_name)
+    return info
+
+
+@lru_cache(maxsize=4096)
+def _default_field_info(field_name: str) -> dict:
+    """Build the placeholder info for an unknown field (cached per name)."""
     return {
         "name": field_name.replace('_', ' ').title(),
         "description": f"Field: {field_name}",
@@ -617,27 +635,26 @@ def get_field_info(field_name: str, context: str = None) -> dict:
     }
 
 
-def get_all_known_fields() -> dict:
+# All known fields organized by category, built once (read-only view)
+_ALL_KNOWN_FIELDS = MappingProxyType({
+    "Top Level": TOP_LEVEL_FIELDS,
+    "Market Change": MARKET_CHANGE_FIELDS,
+    "Market Definition": MARKET_DEFINITION_FIELDS,
+    "Runner Definition": RUNNER_DEFINITION_FIELDS,
+    "Runner Change (Prices)": RUNNER_CHANGE_FIELDS,
+    "Order Change": ORDER_CHANGE_FIELDS,
+    "Unmatched Orders": UNMATCHED_ORDER_FIELDS,
+    "Matched Bets": MATCHED_FIELDS,
+})
+
+
+def get_all_known_fields() -> Mapping[str, dict]:
     """Return all known Betfair fields organized by category."""
-    all_fields = {}
-    
-    for name, fields in [
-        ("Top Level", TOP_LEVEL_FIELDS),
-        ("Market Change", MARKET_CHANGE_FIELDS),
-        ("Market Definition", MARKET_DEFINITION_FIELDS),
-        ("Runner Definition", RUNNER_DEFINITION_FIELDS),
-        ("Runner Change (Prices)", RUNNER_CHANGE_FIELDS),
-        ("Order Change", ORDER_CHANGE_FIELDS),
-        ("Unmatched Orders", UNMATCHED_ORDER_FIELDS),
-        ("Matched Bets", MATCHED_FIELDS),
-    ]:
-        all_fields[name] = fields
-    
-    return all_fields
+    return _ALL_KNOWN_FIELDS
 
 
-# Field categories for grouping in UI
-FIELD_CATEGORIES = {
+# Field categories for grouping in UI (read-only view)
+FIELD_CATEGORIES = MappingProxyType({
     "Message Metadata": {
         "icon": "📨",
         "description": "Stream message control and timing",
@@ -773,4 +790,4 @@ FIELD_CATEGORIES = {
         "description": "Undocumented fields",
         "color": "#9CA3AF"  # Gray
     },
-}
+})
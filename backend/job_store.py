@@ -0,0 +1,451 @@
+"""
+Job Store for CHIMERA Analysis
+
+Holds the status of analysis jobs started through the API.
+
+Two backends share the same async interface:
+- MemoryJobStore: per-process dict with TTL eviction (default, single worker)
+- RedisJobStore: one Redis hash per job (job:{job_id}) with a TTL, so any API
+  worker can answer /status and state survives restarts
+
+Both support fetching many jobs at once and waiting for the next update to any
+of a set of jobs (long-polling). Redis announces updates on job:{job_id}:updates.
+
+The stores also cache finished analysis results by content key (see
+main._result_cache_key) for RESULT_CACHE_TTL seconds, so re-analyzing the same
+data with the same plugin version is answered without rerunning it.
+
+Redis values are orjson-encoded; values of COMPRESS_MIN_BYTES or more (in
+practice, analysis results) are stored zlib-compressed.
+
+Identical analyses in flight are deduplicated through claim_inflight /
+release_inflight: the first job claims the content key and later requests
+join it. The running job keeps its claim alive with refresh_inflight.
+
+With Redis, the store also carries the analysis work queue (ANALYSIS_QUEUE):
+the API enqueues jobs and queue_worker.py processes run them.
+
+Set CHIMERA_REDIS_URL (e.g. redis://10.0.0.3:6379/0) to use Redis. The Redis
+instance should run with maxmemory-policy allkeys-lru so old jobs are evicted
+under memory pressure.
+"""
+
+import asyncio
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+
+# Configuration
+REDIS_URL = os.environ.get("CHIMERA_REDIS_URL", "")
+JOB_TTL_SECONDS = int(os.environ.get("CHIMERA_JOB_TTL", "86400"))  # 24 hours
+RESULT_CACHE_TTL = int(os.environ.get("CHIMERA_RESULT_CACHE_TTL", "3600"))  # 1 hour
+RESULT_CACHE_SIZE = 16  # Results kept by the in-memory store (they can be large)
+# Seconds an in-flight claim lasts unless its running job refreshes it, so
+# the claim of a job whose process died lapses soon after
+INFLIGHT_TTL = int(os.environ.get("CHIMERA_INFLIGHT_TTL", "120"))
+ANALYSIS_QUEUE = "analysis:queue"  # Redis list of pending analysis jobs
+COMPRESS_MIN_BYTES = 16 * 1024  # Encoded Redis values at least this big are compressed
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get("CHIMERA_PROGRESS_FLUSH_INTERVAL", "0.1"))  # seconds
+
+# Prefix marking a compressed Redis value (JSON never starts with "z")
+_COMPRESSED = b"z:"
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a value for Redis, compressing it if large."""
+    data = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _COMPRESSED + zlib.compress(data, 3)
+    return data
+
+
+def _decode_value(raw: bytes) -> Any:
+    """Decode a value written by _encode."""
+    if raw.startswith(_COMPRESSED):
+        raw = zlib.decompress(raw[len(_COMPRESSED):])
+    return orjson.loads(raw)
+
+
+class MemoryJobStore:
+    """In-process job store; jobs expire JOB_TTL_SECONDS after their last update."""
+
+    def __init__(self, ttl: int = JOB_TTL_SECONDS):
+        self.ttl = ttl
+        # job_id -> (expires_at, fields), ordered by last update
+        self._jobs: "OrderedDict[str, tuple]" = OrderedDict()
+        # job_id -> event set (and dropped) on the job's next update
+        self._waiters: Dict[str, asyncio.Event] = {}
+        # cache key -> (expires_at, result), least recently stored first
+        self._results: "OrderedDict[str, tuple]" = OrderedDict()
+        # in-flight key -> (expires_at, job_id)
+        self._inflight: Dict[str, tuple] = {}
+
+    def _evict_expired(self, now: float):
+        """Drop expired jobs from the least recently updated end."""
+        jobs = self._jobs
+        while jobs:
+            job_id, (expires_at, _) = next(iter(jobs.items()))
+            if expires_at > now:
+                break
+            del jobs[job_id]
+            self._notify(job_id)
+
+    def _notify(self, job_id: str):
+        """Wake long-polls waiting on this job."""
+        event = self._waiters.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def create(self, job_id: str, fields: Dict[str, Any]):
+        """Create (or replace) a job with its initial fields."""
+        now = time.monotonic()
+        self._evict_expired(now)
+        self._jobs[job_id] = (now + self.ttl, dict(fields))
+        self._jobs.move_to_end(job_id)
+
+    async def update(self, job_id: str, **fields):
+        """Set fields on an existing job and refresh its TTL."""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return
+        entry[1].update(fields)
+        self._jobs[job_id] = (time.monotonic() + self.ttl, entry[1])
+        self._jobs.move_to_end(job_id)
+        self._notify(job_id)
+
+    async def delete(self, job_id: str):
+        """Forget a job."""
+        if self._jobs.pop(job_id, None) is not None:
+            self._notify(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's fields, or None if unknown or expired."""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._jobs[job_id]
+            return None
+        return entry[1]
+
+    async def get_many(self, job_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Return {job_id: fields or None} for several jobs."""
+        return {job_id: await self.get(job_id) for job_id in job_ids}
+
+    async def wait_for_update(
+        self,
+        job_ids: List[str],
+        timeout: float,
+        seen: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+    ) -> bool:
+        """
+        Wait until any of the jobs is updated.
+
+        seen is accepted for interface parity with RedisJobStore; here no
+        update can slip in between the caller's read and this wait, since
+        both run on the one event loop without yielding.
+
+        Returns:
+            True if an update arrived, False on timeout
+        """
+        waits = []
+        for job_id in job_ids:
+            event = self._waiters.get(job_id)
+            if event is None:
+                event = self._waiters[job_id] = asyncio.Event()
+            waits.append(asyncio.ensure_future(event.wait()))
+        if not waits:
+            return False
+        done, pending = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        return bool(done)
+
+    async def get_cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis result, or None on a miss."""
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._results[key]
+            return None
+        return entry[1]
+
+    async def cache_result(self, key: str, result: Dict[str, Any]):
+        """Cache an analysis result for RESULT_CACHE_TTL seconds."""
+        self._results[key] = (time.monotonic() + RESULT_CACHE_TTL, result)
+        self._results.move_to_end(key)
+        while len(self._results) > RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+
+    async def claim_inflight(self, key: str, job_id: str, ttl: int = INFLIGHT_TTL) -> Optional[str]:
+        """
+        Claim key for job_id unless another job holds it.
+
+        Returns:
+            None if claimed, else the ID of the job holding the key
+        """
+        now = time.monotonic()
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        self._inflight[key] = (now + ttl, job_id)
+        return None
+
+    async def refresh_inflight(self, key: str, job_id: str, ttl: int = INFLIGHT_TTL) -> bool:
+        """Extend job_id's claim on key by ttl seconds; False if it no longer holds it."""
+        now = time.monotonic()
+        entry = self._inflight.get(key)
+        if entry is None or entry[1] != job_id or entry[0] <= now:
+            return False
+        self._inflight[key] = (now + ttl, job_id)
+        return True
+
+    async def release_inflight(self, key: str, job_id: str):
+        """Release key if job_id still holds it."""
+        entry = self._inflight.get(key)
+        if entry is not None and entry[1] == job_id:
+            del self._inflight[key]
+
+
+class RedisJobStore:
+    """Redis-backed job store; each field is stored encoded (see _encode) in a hash."""
+
+    # Delete KEYS[1] only if it still holds ARGV[1]
+    _RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+    # Extends a claim only if it is still held by the same job
+    _REFRESH_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+    def __init__(self, url: str, ttl: int = JOB_TTL_SECONDS):
+        import redis.asyncio as redis
+
+        self.ttl = ttl
+        self._redis = redis.from_url(url)
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"job:{job_id}:updates"
+
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        return {name.decode(): _decode_value(value) for name, value in raw.items()}
+
+    async def _write(self, job_id: str, fields: Dict[str, Any], replace: bool):
+        key = self._key(job_id)
+        mapping = {name: _encode(value) for name, value in fields.items()}
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if replace:
+                pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl)
+            pipe.publish(self._channel(job_id), b"1")
+            await pipe.execute()
+
+    async def create(self, job_id: str, fields: Dict[str, Any]):
+        """Create (or replace) a job with its initial fields."""
+        await self._write(job_id, fields, replace=True)
+
+    async def update(self, job_id: str, **fields):
+        """Set fields on an existing job and refresh its TTL."""
+        if not await self._redis.exists(self._key(job_id)):
+            return
+        await self._write(job_id, fields, replace=False)
+
+    async def delete(self, job_id: str):
+        """Forget a job."""
+        await self._redis.delete(self._key(job_id))
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's fields, or None if unknown or expired."""
+        return self._decode(await self._redis.hgetall(self._key(job_id)))
+
+    async def get_many(self, job_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Return {job_id: fields or None} for several jobs in one round trip."""
+        job_ids = list(job_ids)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._key(job_id))
+            raws = await pipe.execute()
+        return {job_id: self._decode(raw) for job_id, raw in zip(job_ids, raws)}
+
+    async def wait_for_update(
+        self,
+        job_ids: List[str],
+        timeout: float,
+        seen: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+    ) -> bool:
+        """
+        Wait until any of the jobs is updated.
+
+        Args:
+            job_ids: Jobs to watch
+            timeout: Seconds to wait at most
+            seen: The jobs as the caller last read them. Updates published
+                before the subscription took effect are not delivered, so
+                once subscribed the jobs are read again and any difference
+                from seen counts as an update.
+
+        Returns:
+            True if an update arrived, False on timeout
+        """
+        if not job_ids:
+            return False
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        channels = {self._channel(job_id) for job_id in job_ids}
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(*channels)
+
+            # Wait for every subscription to be confirmed, so that updates
+            # from here on are delivered, then catch up on earlier ones
+            confirmed = 0
+            while confirmed < len(channels):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                message = await pubsub.get_message(timeout=remaining)
+                if message is None:
+                    continue
+                if message["type"] != "subscribe":
+                    return True
+                confirmed += 1
+
+            if seen is not None:
+                current = await self.get_many(job_ids)
+                if any(current[job_id] != seen.get(job_id) for job_id in job_ids):
+                    return True
+
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                if message is not None:
+                    return True
+        finally:
+            await pubsub.reset()
+
+    async def get_cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis result, or None on a miss."""
+        raw = await self._redis.get(f"result:{key}")
+        return _decode_value(raw) if raw else None
+
+    async def cache_result(self, key: str, result: Dict[str, Any]):
+        """Cache an analysis result for RESULT_CACHE_TTL seconds."""
+        await self._redis.setex(f"result:{key}", RESULT_CACHE_TTL, _encode(result))
+
+    async def claim_inflight(self, key: str, job_id: str, ttl: int = INFLIGHT_TTL) -> Optional[str]:
+        """
+        Claim key for job_id unless another job holds it.
+
+        Returns:
+            None if claimed, else the ID of the job holding the key
+        """
+        if await self._redis.set(f"inflight:{key}", job_id, nx=True, ex=ttl):
+            return None
+        holder = await self._redis.get(f"inflight:{key}")
+        # The claim may have expired in between; then run unclaimed
+        return holder.decode() if holder else None
+
+    async def refresh_inflight(self, key: str, job_id: str, ttl: int = INFLIGHT_TTL) -> bool:
+        """Extend job_id's claim on key by ttl seconds; False if it no longer holds it."""
+        return bool(await self._redis.eval(self._REFRESH_SCRIPT, 1, f"inflight:{key}", job_id, ttl))
+
+    async def release_inflight(self, key: str, job_id: str):
+        """Release key if job_id still holds it."""
+        await self._redis.eval(self._RELEASE_SCRIPT, 1, f"inflight:{key}", job_id)
+
+    async def enqueue(self, task: Dict[str, Any]):
+        """Append an analysis job (run_analysis_task arguments) to the work queue."""
+        await self._redis.rpush(ANALYSIS_QUEUE, orjson.dumps(task))
+
+    async def dequeue(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest job from the work queue, waiting up to timeout seconds.
+
+        Returns:
+            The job's arguments, or None on timeout
+        """
+        item = await self._redis.blpop([ANALYSIS_QUEUE], timeout=timeout)
+        return orjson.loads(item[1]) if item else None
+
+    async def queue_length(self) -> int:
+        """Number of jobs waiting in the work queue."""
+        return await self._redis.llen(ANALYSIS_QUEUE)
+
+
+class ProgressBuffer:
+    """
+    Coalesces a job's progress updates into at most one store write per
+    PROGRESS_FLUSH_INTERVAL.
+
+    update() only merges fields locally and schedules a flush; flush() writes
+    whatever is pending immediately and should be awaited for terminal states.
+    """
+
+    def __init__(self, store, job_id: str, interval: float = PROGRESS_FLUSH_INTERVAL):
+        self._store = store
+        self.job_id = job_id
+        self.interval = interval
+        self._pending: Dict[str, Any] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        # Writes go out one at a time so an older one never lands last
+        self._write_lock = asyncio.Lock()
+
+    def update(self, **fields):
+        """Merge fields into the pending write and schedule a flush."""
+        self._pending.update(fields)
+        if self._flusher is None:
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        # Cleared before writing so flush() never cancels a write in progress
+        self._flusher = None
+        await self._write()
+
+    async def _write(self):
+        async with self._write_lock:
+            if self._pending:
+                fields, self._pending = self._pending, {}
+                await self._store.update(self.job_id, **fields)
+
+    async def flush(self, **fields):
+        """Write pending fields, plus any given, now."""
+        self._pending.update(fields)
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self._write()
+
+
+def get_job_store():
+    """Create the job store selected by CHIMERA_REDIS_URL."""
+    if REDIS_URL:
+        try:
+            return RedisJobStore(REDIS_URL)
+        except ImportError:
+            print("CHIMERA_REDIS_URL is set but redis is not installed; using in-memory job store")
+    return MemoryJobStore()
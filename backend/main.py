@@ -8,29 +8,41 @@ Now with plugin system for external field definitions.
 """
 
 import os
-import json
-import uuid
 import asyncio
-from typing import Optional, List
+import functools
+import hashlib
+import time
+import multiprocessing
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse, Response
-from pydantic import BaseModel
-
-from analyzer import analyze_records, load_records_from_gcs, stream_progress, stream_result, stream_error, ACTIVE_PLUGIN, USE_PLUGINS
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
+from google.api_core.exceptions import NotFound
+from google.cloud import storage
+
+from analyzer import analyze_records, analyze_records_iter, clear_lookup_caches, load_records_from_gcs, stream_progress, stream_stage, stream_result, stream_error, ACTIVE_PLUGIN, USE_PLUGINS
 from session_manager import (
     generate_session_id,
+    get_storage_client,
+    random_hex,
     save_session,
     get_session,
+    get_session_summary as load_session_summary,
     list_sessions,
     delete_session,
     delete_sessions,
-    export_session,
-    export_sessions,
+    export_session_iter,
+    export_sessions_iter,
     get_session_for_bigquery,
 )
+from job_store import INFLIGHT_TTL, ProgressBuffer, RedisJobStore, get_job_store
 
 # Import plugin system if available
 if USE_PLUGINS:
@@ -42,13 +54,47 @@ if USE_PLUGINS:
         get_bigquery_config,
         get_derived_features,
         get_validation_rules,
+        get_all_known_fields as get_plugin_known_fields,
+        clear_plugin_cache,
+        get_field_info as plugin_get_field_info,
+    )
+else:
+    from betfair_dictionary import (
+        get_all_known_fields,
+        get_field_info as dict_get_field_info,
+        FIELD_CATEGORIES,
     )
 
+# Cloud Batch support is optional (google-cloud-batch may not be installed)
+try:
+    from batch_launcher import api_job_id, get_job_status, launch_batch_job, record_job_event, verify_push_token
+except ImportError:
+    launch_batch_job = record_job_event = None
+
+def _warm_gcs():
+    """Create the shared GCS client and fetch credentials before the first request."""
+    try:
+        get_results_bucket().reload(timeout=10, retry=None)
+        print(f"GCS client ready (results bucket: {RESULTS_BUCKET})")
+    except Exception as e:
+        # Not fatal: requests will retry on demand
+        print(f"GCS warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the GCS client at startup so the first request doesn't pay for it."""
+    await asyncio.to_thread(_warm_gcs)
+    yield
+
+
 # Initialize FastAPI
 app = FastAPI(
     title="CHIMERA Analysis API",
     description="Dynamic field discovery for heterogeneous Betfair data with plugin-based field definitions",
-    version="2.2.0"
+    version="2.2.0",
+    default_response_class=ORJSONResponse,  # orjson instead of stdlib json
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -57,37 +103,188 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in _allowed_origins.split(",")] + ["http://localhost:3000", "http://127.0.0.1:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers reuse a preflight for a day
 )
 
-# In-memory job status (for small deployments)
-# For production, use Firestore or Redis
-job_status = {}
+# Compress large JSON bodies (field dictionaries, sessions). Event streams opt
+# out by declaring Content-Encoding: identity (see _SSE_HEADERS), since gzip
+# would hold frames back until its buffer fills.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+# Bucket where Cloud Batch workers write analysis results
+RESULTS_BUCKET = os.environ.get("CHIMERA_RESULTS_BUCKET", "betfair-chimera-results")
+
+# Job status store: in-memory by default, Redis when CHIMERA_REDIS_URL is set
+job_store = get_job_store()
+
+# Job states after which a job no longer changes
+TERMINAL_STATUSES = frozenset({"complete", "error"})
+
+# Status polling limits: job IDs per batch request, seconds a long-poll may wait
+MAX_STATUS_BATCH = 500
+MAX_STATUS_WAIT = 60
+
+# Background analyses are CPU-bound pure Python, so they run in worker
+# processes (spawned, like analyzer's shard workers, so no client or thread
+# state is forked). The semaphore caps jobs in flight at the pool size; extra
+# jobs wait here instead of piling up in the pool queue. Every web worker
+# (WEB_CONCURRENCY) has its own pool, so by default the cores are shared out
+# between them rather than each worker starting one process per core.
+WEB_WORKERS = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+ANALYSIS_CONCURRENCY = max(1, int(os.environ.get(
+    "CHIMERA_ANALYSIS_CONCURRENCY", str((os.cpu_count() or 1) // WEB_WORKERS)
+)))
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+_analysis_slots = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+# Session uploads run in their own small pool, off the event loop and out of
+# the analysis slots; each save is attempted up to SAVE_ATTEMPTS times
+_save_pool = ThreadPoolExecutor(max_workers=4)
+SAVE_ATTEMPTS = 3
+
+# Background analyses allowed to wait for a slot; beyond that /analyze
+# answers 429 instead of queueing without bound
+MAX_QUEUED_ANALYSES = int(os.environ.get("CHIMERA_MAX_QUEUED_ANALYSES", "16"))
+_analyses_pending = 0  # Submitted background analyses not yet finished
+
+# With CHIMERA_ANALYSIS_QUEUE=1 and a Redis job store, /analyze only enqueues
+# jobs; queue_worker.py processes (scaled separately) run them, and queued
+# jobs survive API restarts
+QUEUE_ANALYSES = os.environ.get("CHIMERA_ANALYSIS_QUEUE", "") == "1" and isinstance(job_store, RedisJobStore)
+MAX_QUEUE_LENGTH = int(os.environ.get("CHIMERA_MAX_QUEUE_LENGTH", "1000"))
+
+
+def get_analysis_pool() -> ProcessPoolExecutor:
+    """Get the analysis process pool, starting it on first use."""
+    global _analysis_pool
+    if _analysis_pool is None:
+        _analysis_pool = ProcessPoolExecutor(
+            max_workers=ANALYSIS_CONCURRENCY,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _analysis_pool
+
+
+# Encoded JSON and its ETag for responses that only change when plugins are
+# reloaded, keyed by (endpoint, plugin_id)
+_response_cache: Dict[tuple, tuple] = {}
+
+# Browsers may reuse a session response this long before revalidating it
+SESSION_CACHE_CONTROL = "private, max-age=10"
+
+
+def _etag(content: bytes) -> str:
+    """Weak ETag from a hash of the encoded body."""
+    return 'W/"' + hashlib.blake2b(content, digest_size=8).hexdigest() + '"'
+
+
+def _conditional_json(request: Optional[Request], content: bytes, etag: str, cache_control: Optional[str] = None) -> Response:
+    """
+    Return the JSON body, or 304 Not Modified if the client already has it.
+    
+    Args:
+        request: Incoming request (checked for If-None-Match), or None
+        content: Encoded JSON body
+        etag: ETag for content
+        cache_control: Optional Cache-Control header value
+    
+    Returns:
+        200 response with the body, or an empty 304
+    """
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    
+    if request is not None:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # The client may send several tags, or "*"
+            tags = {tag.strip() for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags or etag[2:] in tags:
+                return Response(status_code=304, headers=headers)
+    
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _cached_json(key: tuple, build, error_status: int = 404, error_prefix: str = "Plugin not found",
+                 request: Optional[Request] = None) -> Response:
+    """
+    Return a JSON response whose body is built and encoded once per key.
+    
+    Args:
+        key: Cache key, (endpoint, plugin_id)
+        build: Callable returning the response payload
+        error_status: HTTP status if build raises
+        error_prefix: Detail prefix if build raises
+        request: Incoming request, to answer If-None-Match with 304
+    
+    Returns:
+        Response with the cached body
+    """
+    entry = _response_cache.get(key)
+    if entry is None:
+        try:
+            content = orjson.dumps(build(), option=orjson.OPT_NON_STR_KEYS)
+        except Exception as e:
+            raise HTTPException(status_code=error_status, detail=f"{error_prefix}: {str(e)}")
+        entry = _response_cache[key] = (content, _etag(content))
+    return _conditional_json(request, *entry)
+
+
+# (epoch second, ISO string) for the last formatted timestamp
+_now_cache = (None, "")
+
+
+def utc_now_iso() -> str:
+    """Current UTC time in ISO format at second resolution, formatted once per second."""
+    global _now_cache
+    second = int(time.time())
+    cached_second, iso = _now_cache
+    if second != cached_second:
+        iso = datetime.utcfromtimestamp(second).isoformat()
+        _now_cache = (second, iso)
+    return iso
 
 
 class AnalyzeRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     bucket_url: str
     use_batch: bool = False  # Use Cloud Batch for large datasets
     create_session: bool = True  # Auto-create session with results
     plugin_id: Optional[str] = None  # Plugin to use (default: betfair)
+    force_refresh: bool = False  # Re-run even if a cached result exists
 
 
 class DeleteSessionsRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     session_ids: List[str]
 
 
 class ExportSessionsRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     session_ids: List[str]
     format: str = "json"  # 'json' or 'summary'
 
 
+class StatusBatchRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    job_ids: List[str]
+
+
 class JobStatus(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     job_id: str
     status: str
     message: Optional[str] = None
     progress: Optional[int] = None
-    result: Optional[dict] = None
+    result: Optional[Dict[str, Any]] = Field(default=None, repr=False)  # Can be large
     session_id: Optional[str] = None
 
 
@@ -116,7 +313,7 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": utc_now_iso()}
 
 
 # ============================================================================
@@ -144,6 +341,29 @@ async def get_plugins():
         raise HTTPException(status_code=500, detail=f"Error listing plugins: {str(e)}")
 
 
+@app.post("/plugins/reload")
+async def reload_plugins():
+    """
+    Drop cached plugin definitions so edited plugin files take effect.
+    
+    Plugins are reloaded from source on next use. Analysis worker processes
+    keep their own caches, so the pool is retired and restarted on demand;
+    jobs already running finish with the definitions they started with.
+    """
+    global _analysis_pool
+    if not USE_PLUGINS:
+        raise HTTPException(status_code=400, detail="Plugin system not available")
+    
+    clear_plugin_cache()
+    clear_lookup_caches()
+    _response_cache.clear()
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown(wait=False)
+        _analysis_pool = None
+    
+    return {"reloaded": True, "active_plugin": ACTIVE_PLUGIN}
+
+
 @app.get("/plugins/{plugin_id}")
 async def get_plugin_details(plugin_id: str):
     """Get detailed information about a specific plugin."""
@@ -173,7 +393,7 @@ async def get_plugin_fields(plugin_id: str):
     if not USE_PLUGINS:
         raise HTTPException(status_code=400, detail="Plugin system not available")
     
-    try:
+    def build():
         plugin = load_plugin(plugin_id)
         fields = {}
         for key, field_def in plugin.fields.items():
@@ -189,8 +409,8 @@ async def get_plugin_fields(plugin_id: str):
             "field_count": len(fields),
             "fields": fields
         }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Plugin not found: {str(e)}")
+    
+    return _cached_json(("fields", plugin_id), build)
 
 
 @app.get("/plugins/{plugin_id}/categories")
@@ -199,15 +419,15 @@ async def get_plugin_categories(plugin_id: str):
     if not USE_PLUGINS:
         raise HTTPException(status_code=400, detail="Plugin system not available")
     
-    try:
+    def build():
         categories = get_all_categories(plugin_id)
         return {
             "plugin_id": plugin_id,
             "category_count": len(categories),
             "categories": categories
         }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Plugin not found: {str(e)}")
+    
+    return _cached_json(("categories", plugin_id), build)
 
 
 @app.get("/plugins/{plugin_id}/ml")
@@ -216,16 +436,14 @@ async def get_plugin_ml_recommendations(plugin_id: str):
     if not USE_PLUGINS:
         raise HTTPException(status_code=400, detail="Plugin system not available")
     
-    try:
-        ml_recs = get_ml_recommendations(plugin_id)
-        derived = get_derived_features(plugin_id)
+    def build():
         return {
             "plugin_id": plugin_id,
-            "models": ml_recs,
-            "derived_features": derived
+            "models": get_ml_recommendations(plugin_id),
+            "derived_features": get_derived_features(plugin_id)
         }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Plugin not found: {str(e)}")
+    
+    return _cached_json(("ml", plugin_id), build)
 
 
 @app.get("/plugins/{plugin_id}/bigquery")
@@ -234,14 +452,13 @@ async def get_plugin_bigquery_config(plugin_id: str):
     if not USE_PLUGINS:
         raise HTTPException(status_code=400, detail="Plugin system not available")
     
-    try:
-        bq_config = get_bigquery_config(plugin_id)
+    def build():
         return {
             "plugin_id": plugin_id,
-            "config": bq_config
+            "config": get_bigquery_config(plugin_id)
         }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Plugin not found: {str(e)}")
+    
+    return _cached_json(("bigquery", plugin_id), build)
 
 
 @app.get("/plugins/{plugin_id}/validation")
@@ -250,14 +467,13 @@ async def get_plugin_validation_rules(plugin_id: str):
     if not USE_PLUGINS:
         raise HTTPException(status_code=400, detail="Plugin system not available")
     
-    try:
-        validation = get_validation_rules(plugin_id)
+    def build():
         return {
             "plugin_id": plugin_id,
-            "rules": validation
+            "rules": get_validation_rules(plugin_id)
         }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Plugin not found: {str(e)}")
+    
+    return _cached_json(("validation", plugin_id), build)
 
 
 # ============================================================================
@@ -275,30 +491,74 @@ async def analyze(request: AnalyzeRequest, background_tasks: BackgroundTasks):
     If create_session=True (default), a session will be created with the results.
     
     Optionally specify plugin_id to use a specific plugin for field definitions.
+    
+    Returns 429 when every analysis slot is busy and the wait queue is full.
     """
-    job_id = f"job-{uuid.uuid4().hex[:12]}"
-    session_id = generate_session_id() if request.create_session else None
+    global _analyses_pending
+    if not request.use_batch:
+        if QUEUE_ANALYSES:
+            busy = await job_store.queue_length() >= MAX_QUEUE_LENGTH
+        else:
+            busy = _analyses_pending >= ANALYSIS_CONCURRENCY + MAX_QUEUED_ANALYSES
+        if busy:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many analyses in progress, try again later",
+                headers={"Retry-After": "30"}
+            )
+    
+    job_id = f"job-{random_hex(12)}"
     plugin_id = request.plugin_id or ACTIVE_PLUGIN
     
-    # Initialize job status
-    job_status[job_id] = {
+    session_id = generate_session_id() if request.create_session else None
+    
+    # Initialize job status (before claiming, so a concurrent identical
+    # request that finds the claim also finds this job)
+    await job_store.create(job_id, {
         "status": "submitted",
         "message": "Analysis job submitted",
         "progress": 0,
         "bucket_url": request.bucket_url,
-        "started_at": datetime.utcnow().isoformat(),
+        "started_at": utc_now_iso(),
         "create_session": request.create_session,
         "session_id": session_id,
         "plugin_id": plugin_id,
-    }
+    })
+    
+    flight_key = None
+    if not request.use_batch:
+        # Join an identical analysis already in flight instead of repeating it
+        flight_key = await _flight_key(request.bucket_url, plugin_id, request.create_session, request.force_refresh)
+        holder = await job_store.claim_inflight(flight_key, job_id)
+        if holder:
+            existing = await job_store.get(holder)
+            if existing is not None and existing["status"] not in TERMINAL_STATUSES:
+                await job_store.delete(job_id)
+                return {
+                    "type": "submitted",
+                    "job_id": holder,
+                    "session_id": existing.get("session_id"),
+                    "plugin_id": plugin_id,
+                    "message": "Identical analysis already in progress",
+                    "status_url": f"/status/{holder}",
+                    "deduplicated": True,
+                }
+            # Stale claim: its job finished (or expired) without releasing it
+            await job_store.release_inflight(flight_key, holder)
+            if await job_store.claim_inflight(flight_key, job_id):
+                flight_key = None  # Lost a race; run without a claim
     
     if request.use_batch:
         # Launch Cloud Batch job for large datasets
+        if launch_batch_job is None:
+            raise HTTPException(status_code=501, detail="Cloud Batch support is not installed")
         try:
-            from batch_launcher import launch_batch_job
-            batch_job_id = launch_batch_job(job_id, request.bucket_url)
-            job_status[job_id]["batch_job_id"] = batch_job_id
-            job_status[job_id]["message"] = "Launched Cloud Batch job"
+            batch_job_id = await asyncio.to_thread(launch_batch_job, job_id, request.bucket_url)
+            await job_store.update(
+                job_id,
+                batch_job_id=batch_job_id,
+                message="Launched Cloud Batch job"
+            )
             
             return {
                 "type": "submitted",
@@ -311,15 +571,22 @@ async def analyze(request: AnalyzeRequest, background_tasks: BackgroundTasks):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to launch batch job: {str(e)}")
     else:
-        # Run analysis directly (for smaller datasets)
-        background_tasks.add_task(
-            run_analysis_task, 
-            job_id, 
-            request.bucket_url, 
-            request.create_session,
-            session_id,
-            plugin_id
-        )
+        task = {
+            "job_id": job_id,
+            "bucket_url": request.bucket_url,
+            "create_session": request.create_session,
+            "session_id": session_id,
+            "plugin_id": plugin_id,
+            "force_refresh": request.force_refresh,
+            "flight_key": flight_key,
+        }
+        if QUEUE_ANALYSES:
+            # Run on a queue worker
+            await job_store.enqueue(task)
+        else:
+            # Run analysis directly (for smaller datasets)
+            _analyses_pending += 1
+            background_tasks.add_task(run_local_analysis, **task)
         
         return {
             "type": "submitted",
@@ -331,74 +598,153 @@ async def analyze(request: AnalyzeRequest, background_tasks: BackgroundTasks):
         }
 
 
-async def run_analysis_task(job_id: str, bucket_url: str, create_session: bool = True, session_id: str = None, plugin_id: str = None):
-    """Background task to run analysis and optionally create a session."""
+def _save_session_with_retry(**kwargs) -> Dict:
+    """Call save_session, retrying failures with exponential backoff (1s, 2s)."""
+    for attempt in range(SAVE_ATTEMPTS):
+        try:
+            return save_session(**kwargs)
+        except Exception as e:
+            if attempt + 1 == SAVE_ATTEMPTS:
+                raise
+            print(f"Session save attempt {attempt + 1} failed ({e}), retrying")
+            time.sleep(2 ** attempt)
+
+
+async def _result_cache_key(bucket_url: str, plugin_id: str) -> str:
+    """Content key for an analysis: same data URL, plugin and plugin version."""
+    if USE_PLUGINS:
+        # A cold plugin cache means several GCS reads; keep them off the loop
+        version = (await asyncio.to_thread(load_plugin, plugin_id)).version
+    else:
+        version = "legacy"
+    return hashlib.sha256(f"{bucket_url}|{plugin_id}|{version}".encode()).hexdigest()
+
+
+async def _flight_key(bucket_url: str, plugin_id: str, create_session: bool, force_refresh: bool) -> str:
+    """
+    In-flight dedup key: same analysis, whether it saves a session, and
+    whether it bypasses the result cache (a refresh must not join a job that
+    may answer from the cache).
+    """
+    return f"{await _result_cache_key(bucket_url, plugin_id)}:{int(create_session)}:{int(force_refresh)}"
+
+
+async def run_analysis_task(job_id: str, bucket_url: str, create_session: bool = True, session_id: str = None, plugin_id: str = None, force_refresh: bool = False, flight_key: str = None):
+    """
+    Run an analysis job and optionally create a session.
+    
+    Runs as a background task of /analyze, or on a queue worker when
+    QUEUE_ANALYSES is set. A result cached for the same data and plugin
+    version is reused unless force_refresh is set. flight_key, if given, is
+    the in-flight dedup claim to release when the job ends.
+    """
+    # Progress writes are coalesced; terminal states are flushed at once
+    progress = ProgressBuffer(job_store, job_id)
+    heartbeat = asyncio.create_task(_keep_inflight_claim(flight_key, job_id)) if flight_key else None
     try:
         if plugin_id is None:
             plugin_id = ACTIVE_PLUGIN
             
-        job_status[job_id]["status"] = "running"
-        job_status[job_id]["message"] = f"Loading data (using plugin: {plugin_id})..."
-        job_status[job_id]["progress"] = 10
+        progress.update(
+            status="running",
+            message=f"Loading data (using plugin: {plugin_id})...",
+            progress=10
+        )
+        
+        cache_key = await _result_cache_key(bucket_url, plugin_id)
+        result = None if force_refresh else await job_store.get_cached_result(cache_key)
         
-        # Run analysis with plugin
-        result = analyze_records(bucket_url=bucket_url, plugin_id=plugin_id)
+        if result is None:
+            # Run analysis with plugin in the process pool, off the event loop
+            async with _analysis_slots:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    get_analysis_pool(),
+                    functools.partial(analyze_records, bucket_url=bucket_url, plugin_id=plugin_id)
+                )
+            await job_store.cache_result(cache_key, result)
         
         # Create session if requested
         if create_session and session_id:
-            job_status[job_id]["message"] = "Saving session..."
-            job_status[job_id]["progress"] = 90
+            progress.update(message="Saving session...", progress=90)
             
             try:
-                save_session(
-                    session_id=session_id,
-                    source_url=bucket_url,
-                    analysis_result=result,
-                    metadata={"job_id": job_id}
+                # Upload in the save pool so the event loop keeps serving
+                await asyncio.get_running_loop().run_in_executor(
+                    _save_pool,
+                    functools.partial(
+                        _save_session_with_retry,
+                        session_id=session_id,
+                        source_url=bucket_url,
+                        analysis_result=result,
+                        metadata={"job_id": job_id}
+                    )
                 )
-                job_status[job_id]["session_saved"] = True
+                progress.update(session_saved=True)
             except Exception as e:
                 print(f"Failed to save session: {e}")
-                job_status[job_id]["session_saved"] = False
-                job_status[job_id]["session_error"] = str(e)
+                progress.update(session_saved=False, session_error=str(e))
         
-        job_status[job_id]["status"] = "complete"
-        job_status[job_id]["message"] = "Analysis complete"
-        job_status[job_id]["progress"] = 100
-        job_status[job_id]["result"] = result
-        job_status[job_id]["completed_at"] = datetime.utcnow().isoformat()
+        await progress.flush(
+            status="complete",
+            message="Analysis complete",
+            progress=100,
+            result=result,
+            completed_at=utc_now_iso()
+        )
         
     except Exception as e:
-        job_status[job_id]["status"] = "error"
-        job_status[job_id]["message"] = str(e)
-        job_status[job_id]["error"] = str(e)
+        await progress.flush(status="error", message=str(e), error=str(e))
+    
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+        if flight_key:
+            await job_store.release_inflight(flight_key, job_id)
 
 
-@app.get("/status/{job_id}")
-async def get_status(job_id: str):
-    """Get status of an analysis job."""
-    if job_id not in job_status:
-        # Try to load from GCS (for batch jobs)
-        try:
-            from google.cloud import storage
-            client = storage.Client()
-            bucket = client.bucket("betfair-chimera-results")
-            blob = bucket.blob(f"{job_id}/analysis_result.json")
-            
-            if blob.exists():
-                result = json.loads(blob.download_as_text())
-                return {
-                    "status": "complete",
-                    "job_id": job_id,
-                    "result": result,
-                }
-        except:
-            pass
-        
-        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
-    
-    status = job_status[job_id]
+async def _keep_inflight_claim(flight_key: str, job_id: str):
+    """
+    Refresh a running job's in-flight claim until cancelled.
     
+    Claims last INFLIGHT_TTL seconds, so if this process dies mid-analysis
+    the claim lapses soon after and identical requests run the analysis
+    again instead of joining the dead job.
+    """
+    while True:
+        await asyncio.sleep(INFLIGHT_TTL / 4)
+        try:
+            if not await job_store.refresh_inflight(flight_key, job_id):
+                return  # Claim lost (expired and taken over)
+        except Exception as e:
+            print(f"Could not refresh in-flight claim for {job_id}: {e}")
+
+
+async def run_local_analysis(**task):
+    """Background task: run an analysis counted in _analyses_pending by /analyze."""
+    global _analyses_pending
+    try:
+        await run_analysis_task(**task)
+    finally:
+        _analyses_pending -= 1
+
+
+@functools.lru_cache(maxsize=1)
+def get_results_bucket() -> storage.Bucket:
+    """Get the (cached) handle for the Cloud Batch results bucket."""
+    return get_storage_client().bucket(RESULTS_BUCKET)
+
+
+def _load_batch_result(job_id: str) -> Optional[bytes]:
+    """Download a Cloud Batch job's result JSON from GCS, or None if not written yet."""
+    blob = get_results_bucket().blob(f"{job_id}/analysis_result.json")
+    try:
+        return blob.download_as_bytes()
+    except NotFound:
+        return None
+
+
+def _status_response(job_id: str, status: dict) -> dict:
+    """Build the public status payload from a stored job."""
     response = {
         "job_id": job_id,
         "status": status["status"],
@@ -418,91 +764,263 @@ async def get_status(job_id: str):
     return response
 
 
+@app.get("/status/{job_id}")
+async def get_status(job_id: str, wait: float = Query(0, ge=0, le=MAX_STATUS_WAIT)):
+    """
+    Get status of an analysis job.
+    
+    With wait > 0 this long-polls: if the job is still in progress, the
+    response is held until its next update or until wait seconds pass.
+    """
+    status = await job_store.get(job_id)
+    if status is None:
+        # Try to load from GCS (for batch jobs)
+        try:
+            result = await asyncio.to_thread(_load_batch_result, job_id)
+            if result is not None:
+                # The worker wrote JSON; splice it in rather than parsing and
+                # re-encoding it
+                return Response(
+                    content=b'{"status":"complete","job_id":' + orjson.dumps(job_id) + b',"result":' + result + b'}',
+                    media_type="application/json"
+                )
+        except Exception as e:
+            # GCS unavailable, no credentials, transport errors: report as not found
+            print(f"Error loading batch result for {job_id}: {e}")
+        
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    if wait and status["status"] not in TERMINAL_STATUSES:
+        if await job_store.wait_for_update([job_id], wait, {job_id: status}):
+            status = await job_store.get(job_id) or status
+    
+    return _status_response(job_id, status)
+
+
+@app.post("/status/batch")
+async def get_status_batch(request: StatusBatchRequest, wait: float = Query(0, ge=0, le=MAX_STATUS_WAIT)):
+    """
+    Get the status of several analysis jobs in one request.
+    
+    Jobs are read from the job store in one batch; unknown jobs are reported
+    with status "not_found" (batch results in GCS are not checked here). With
+    wait > 0 and every known job still in progress, the response is held
+    until any of them is updated or until wait seconds pass.
+    """
+    job_ids = list(dict.fromkeys(request.job_ids))
+    if len(job_ids) > MAX_STATUS_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STATUS_BATCH} job IDs per request")
+    
+    statuses = await job_store.get_many(job_ids)
+    
+    if wait:
+        pending = [j for j, st in statuses.items() if st is not None and st["status"] not in TERMINAL_STATUSES]
+        known = [j for j, st in statuses.items() if st is not None]
+        if pending and len(pending) == len(known):
+            if await job_store.wait_for_update(pending, wait, statuses):
+                statuses = await job_store.get_many(job_ids)
+    
+    return {
+        "jobs": {
+            job_id: _status_response(job_id, st) if st is not None else {"job_id": job_id, "status": "not_found"}
+            for job_id, st in statuses.items()
+        }
+    }
+
+
+def _sse(payload: bytes) -> bytes:
+    """Frame an encoded JSON payload as one Server-Sent Event."""
+    return b"data: " + payload + b"\n\n"
+
+
+# Seconds between "still working" frames while a blocking step runs
+SSE_HEARTBEAT_INTERVAL = float(os.environ.get("CHIMERA_SSE_HEARTBEAT", "10"))
+
+# Event streams must not be cached or buffered by proxies (nginx, Cloud Run
+# front ends), otherwise progress frames arrive in one burst at the end
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+    "Content-Encoding": "identity",
+}
+
+# Progress frames with fixed text, encoded once rather than per stream
+_SSE_LOADING = _sse(stream_progress("Loading data from GCS...", 10))
+_SSE_DISCOVERING = _sse(stream_progress("Discovering fields...", 40))
+_SSE_COMPLETE = _sse(stream_progress("Analysis complete!", 100))
+
+
+async def _heartbeat_until(future: asyncio.Future, message: str, progress: int):
+    """
+    Yield a progress frame every SSE_HEARTBEAT_INTERVAL seconds until the
+    future completes, so proxies keep the idle stream open.
+    
+    Args:
+        future: Executor future for the blocking step
+        message: Progress message to repeat while waiting
+        progress: Progress percentage to repeat while waiting
+    """
+    frame = None
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=SSE_HEARTBEAT_INTERVAL)
+        if done:
+            return
+        if frame is None:
+            frame = _sse(stream_progress(message, progress))
+        yield frame
+
+
 @app.post("/analyze/stream")
 async def analyze_stream(request: AnalyzeRequest):
     """
     Stream analysis results as they're computed.
     Returns Server-Sent Events with progress updates.
+    
+    Result sections arrive in "stage" events ({"stage": name, "data": {...}})
+    as each analysis phase finishes; the final "result" event holds the
+    remaining keys (totals and schema recommendations). Merging every
+    stage's data with the result data gives the full analysis result.
     """
     plugin_id = request.plugin_id or ACTIVE_PLUGIN
     
     async def generate():
         try:
-            yield f"data: {stream_progress(f'Starting analysis with plugin: {plugin_id}...', 0)}\n\n"
-            
-            yield f"data: {stream_progress('Loading data from GCS...', 10)}\n\n"
+            yield _sse(stream_progress(f"Starting analysis with plugin: {plugin_id}...", 0))
             
-            # Load records
-            records = load_records_from_gcs(request.bucket_url)
+            yield _SSE_LOADING
             
-            yield f"data: {stream_progress(f'Loaded {len(records):,} records', 30)}\n\n"
+            # Load records in a worker thread so the event loop keeps serving
+            # other requests (and this stream's heartbeats) during the download
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, load_records_from_gcs, request.bucket_url)
+            async for frame in _heartbeat_until(future, "Still loading data...", 10):
+                yield frame
+            records = future.result()
             
-            yield f"data: {stream_progress('Discovering fields...', 40)}\n\n"
+            yield _sse(stream_progress(f"Loaded {len(records):,} records", 30))
             
-            # Run analysis with plugin
-            result = analyze_records(records=records, plugin_id=plugin_id)
+            yield _SSE_DISCOVERING
             
-            yield f"data: {stream_progress('Analysis complete!', 100)}\n\n"
-            
-            yield f"data: {stream_result(result)}\n\n"
+            # Run analysis phase by phase; each result section is sent as a
+            # "stage" event as soon as it is ready, and the final "result"
+            # event carries only the sections not already streamed
+            stages = analyze_records_iter(records=records, plugin_id=plugin_id)
+            sent = set()
+            while True:
+                future = loop.run_in_executor(None, next, stages, None)
+                async for frame in _heartbeat_until(future, "Still analyzing...", 40):
+                    yield frame
+                item = future.result()
+                if item is None:
+                    break
+                stage, payload = item
+                
+                if stage == "complete":
+                    yield _SSE_COMPLETE
+                    yield _sse(stream_result({k: v for k, v in payload.items() if k not in sent}))
+                else:
+                    sent.update(payload)
+                    yield _sse(stream_stage(stage, payload))
             
         except Exception as e:
-            yield f"data: {stream_error(str(e))}\n\n"
+            yield _sse(stream_error(str(e)))
     
     return StreamingResponse(
         generate(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+        headers=_SSE_HEADERS
     )
 
 
+async def _finish_batch_job(job_id: str, batch_status: dict):
+    """Move an API job launched on Cloud Batch to its terminal state."""
+    job = await job_store.get(job_id)
+    if job is None or job["status"] in TERMINAL_STATUSES:
+        return
+    
+    if batch_status["status"] == "complete":
+        result = await asyncio.to_thread(_load_batch_result, job_id)
+        if result is not None:
+            await job_store.update(
+                job_id,
+                status="complete",
+                message="Analysis complete",
+                progress=100,
+                result=orjson.loads(result),
+                completed_at=utc_now_iso()
+            )
+            return
+        error = "Cloud Batch job succeeded but wrote no result"
+    else:
+        error = f"Cloud Batch job ended in state {batch_status['batch_status']}"
+    
+    await job_store.update(job_id, status="error", message=error, error=error)
+
+
+@app.post("/batch/events", status_code=204)
+async def batch_events(envelope: dict, authorization: Optional[str] = Header(None)):
+    """
+    Pub/Sub push endpoint for Cloud Batch job state changes.
+    
+    Batch publishes to CHIMERA_BATCH_EVENTS_TOPIC; a push subscription with
+    an authenticated push identity (see BATCH_EVENTS_AUDIENCE and
+    BATCH_EVENTS_SERVICE_ACCOUNT in batch_launcher) pointed here moves the
+    API job to its final status as soon as its Batch job ends.
+    """
+    if record_job_event is None:
+        raise HTTPException(status_code=501, detail="Cloud Batch support is not installed")
+    
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Missing bearer token", headers={"WWW-Authenticate": "Bearer"})
+    if not await asyncio.to_thread(verify_push_token, token):
+        raise HTTPException(status_code=403, detail="Push token rejected")
+    
+    message = envelope.get("message") or {}
+    batch_job_id = record_job_event(message.get("attributes") or {})
+    job_id = api_job_id(batch_job_id) if batch_job_id else None
+    if job_id is not None:
+        # Answered from the state just recorded, no Batch RPC
+        await _finish_batch_job(job_id, get_job_status(batch_job_id))
+    
+    # Always acknowledge; unrelated messages must not be redelivered
+    return Response(status_code=204)
+
+
 @app.get("/field-dictionary")
-async def get_field_dictionary(plugin_id: Optional[str] = None):
+async def get_field_dictionary(request: Request, plugin_id: Optional[str] = None):
     """Get the complete field dictionary from a plugin."""
     if USE_PLUGINS:
         pid = plugin_id or ACTIVE_PLUGIN
-        try:
-            plugin = load_plugin(pid)
-            fields = {}
-            for key, field_def in plugin.fields.items():
-                fields[key] = {
-                    "name": field_def.full_name,
-                    "type": field_def.type,
-                    "category": field_def.category,
-                    "description": field_def.description,
-                    "ml_relevance": field_def.ml_relevance,
-                }
-            categories = get_all_categories(pid)
-            
+        
+        def build():
             return {
                 "plugin_id": pid,
-                "fields": fields,
-                "categories": categories,
+                "fields": get_plugin_known_fields(pid),
+                "categories": get_all_categories(pid),
             }
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error loading plugin: {str(e)}")
+        
+        return _cached_json(("field-dictionary", pid), build, 500, "Error loading plugin", request)
     else:
         # Legacy mode
-        from betfair_dictionary import get_all_known_fields, FIELD_CATEGORIES
-        return {
-            "plugin_id": "legacy",
-            "fields": get_all_known_fields(),
-            "categories": FIELD_CATEGORIES,
-        }
+        def build():
+            return {
+                "plugin_id": "legacy",
+                "fields": dict(get_all_known_fields()),
+                "categories": dict(FIELD_CATEGORIES),
+            }
+        
+        return _cached_json(("field-dictionary", "legacy"), build, 500, "Error loading dictionary", request)
 
 
 @app.get("/field/{field_name}")
 async def get_single_field_info(field_name: str, context: Optional[str] = None, plugin_id: Optional[str] = None):
     """Get information about a specific field."""
     if USE_PLUGINS:
-        from plugin_loader import get_field_info as plugin_get_field_info
         pid = plugin_id or ACTIVE_PLUGIN
         info = plugin_get_field_info(field_name, pid, context)
     else:
-        from betfair_dictionary import get_field_info as dict_get_field_info
         info = dict_get_field_info(field_name, context)
     
     return {
@@ -515,60 +1033,63 @@ async def get_single_field_info(field_name: str, context: Optional[str] = None,
 # =============================================================================
 # SESSION MANAGEMENT ENDPOINTS
 # =============================================================================
+# session_manager uses the blocking GCS client, so its calls run in worker
+# threads to keep the event loop free for other requests
 
 @app.get("/sessions")
-async def get_sessions(limit: int = 50):
+async def get_sessions(limit: int = Query(50, ge=1), start_after: Optional[str] = None):
     """
-    List all saved sessions.
+    List saved sessions, newest first.
     
-    Returns session summaries (not full analysis data).
+    Returns session summaries (not full analysis data). When more sessions
+    remain, next_start_after is a cursor to pass as start_after for the next
+    page.
     """
     try:
-        sessions = list_sessions(limit=limit)
+        sessions, next_start_after = await asyncio.to_thread(list_sessions, limit=limit, start_after=start_after)
         return {
             "sessions": sessions,
             "count": len(sessions),
+            "next_start_after": next_start_after,
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list sessions: {str(e)}")
 
 
 @app.get("/sessions/{session_id}")
-async def get_session_by_id(session_id: str):
+async def get_session_by_id(session_id: str, request: Request):
     """
     Get a specific session by ID.
     
-    Returns full session data including analysis results.
+    Returns full session data including analysis results. Sends an ETag and
+    answers a matching If-None-Match with 304 Not Modified.
     """
-    session = get_session(session_id)
+    session = await asyncio.to_thread(get_session, session_id)
     
     if not session:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
     
-    return session
+    content = orjson.dumps(session, option=orjson.OPT_NON_STR_KEYS)
+    return _conditional_json(request, content, _etag(content), SESSION_CACHE_CONTROL)
 
 
 @app.get("/sessions/{session_id}/summary")
-async def get_session_summary(session_id: str):
+async def get_session_summary(session_id: str, request: Request):
     """
     Get a session summary (without full analysis data).
     
-    Useful for quick lookups and listings.
+    Useful for quick lookups and listings. Supports If-None-Match like
+    GET /sessions/{session_id}.
     """
-    session = get_session(session_id)
+    summary = await asyncio.to_thread(load_session_summary, session_id)
     
-    if not session:
+    if not summary:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
     
-    return {
-        "session_id": session["session_id"],
-        "source_url": session["source_url"],
-        "created_at": session["created_at"],
-        "status": session["status"],
-        "summary": session.get("summary", {}),
-        "schema_recommendations": session.get("schema_recommendations", {}),
-        "ml_suggestions": session.get("ml_suggestions", []),
-    }
+    content = orjson.dumps(summary, option=orjson.OPT_NON_STR_KEYS)
+    return _conditional_json(request, content, _etag(content), SESSION_CACHE_CONTROL)
 
 
 @app.get("/sessions/{session_id}/bigquery")
@@ -581,7 +1102,7 @@ async def get_session_for_bq(session_id: str):
     - schema: BigQuery table schema recommendations
     - field info for mapping
     """
-    bq_data = get_session_for_bigquery(session_id)
+    bq_data = await asyncio.to_thread(get_session_for_bigquery, session_id)
     
     if not bq_data:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
@@ -592,7 +1113,7 @@ async def get_session_for_bq(session_id: str):
 @app.delete("/sessions/{session_id}")
 async def delete_session_by_id(session_id: str):
     """Delete a session by ID."""
-    success = delete_session(session_id)
+    success = await asyncio.to_thread(delete_session, session_id)
     
     if not success:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
@@ -603,7 +1124,7 @@ async def delete_session_by_id(session_id: str):
 @app.post("/sessions/delete")
 async def delete_multiple_sessions(request: DeleteSessionsRequest):
     """Delete multiple sessions at once."""
-    result = delete_sessions(request.session_ids)
+    result = await asyncio.to_thread(delete_sessions, request.session_ids)
     return result
 
 
@@ -615,15 +1136,15 @@ async def export_session_by_id(session_id: str, format: str = "json"):
     Args:
         format: 'json' (full) or 'summary' (condensed)
     """
-    export_data = export_session(session_id, format=format)
+    chunks = await asyncio.to_thread(export_session_iter, session_id, format)
     
-    if not export_data:
+    if chunks is None:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
     
     filename = f"{session_id}.json" if format == "json" else f"{session_id}_summary.json"
     
-    return Response(
-        content=export_data,
+    return StreamingResponse(
+        chunks,
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -634,14 +1155,14 @@ async def export_session_by_id(session_id: str, format: str = "json"):
 @app.post("/sessions/export")
 async def export_multiple_sessions(request: ExportSessionsRequest):
     """
-    Export multiple sessions as a combined JSON file.
+    Export multiple sessions as a combined JSON file (streamed).
     """
-    export_data = export_sessions(request.session_ids, format=request.format)
-    
     filename = f"sessions_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
     
-    return Response(
-        content=export_data,
+    # Sessions are fetched and sent one at a time (the sync iterator runs in
+    # Starlette's threadpool), so large exports are never held in memory
+    return StreamingResponse(
+        export_sessions_iter(request.session_ids, format=request.format),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -650,6 +1171,23 @@ async def export_multiple_sessions(request: ExportSessionsRequest):
 
 
 # Run with: uvicorn main:app --host 0.0.0.0 --port 8080
+# (uvicorn reads the worker count from WEB_CONCURRENCY)
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    
+    # Several workers only pay off once analyses run on queue workers (which
+    # needs the shared Redis job store). Otherwise the 429 limit, the
+    # analysis pool and /plugins/reload would each apply per web worker.
+    default_workers = (os.cpu_count() or 1) * 2 + 1 if QUEUE_ANALYSES else 1
+    workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+    
+    # Worker processes read it back to size their analysis pools
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=workers,
+        loop="auto",  # uvloop / httptools when installed
+        http="auto",
+    )
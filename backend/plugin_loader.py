@@ -12,14 +12,27 @@ Plugin Structure:
   ├── validation.json      # Validation rules
   ├── ml_recommendations.json  # ML model suggestions
   └── bigquery.json        # BigQuery schema recommendations
+
+A plugin may instead (or also) provide bundle.json: one object holding the
+files above under the keys in BUNDLE_KEYS ({"manifest": {...}, "fields":
+{...}, ...}). It is fetched in a single request and takes precedence over
+the separate files; keep manifest.json beside it, since plugin listings read
+only manifests. Build one with bundle_plugin_files().
 """
 
-import json
+import hashlib
 import os
-from typing import Dict, List, Optional, Any
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass, field
+from functools import lru_cache
+from google.api_core.exceptions import NotFound, NotModified
 from google.cloud import storage
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +51,41 @@ LOCAL_PLUGIN_PATHS = [
 # Cache for loaded plugins
 _plugin_cache: Dict[str, 'Plugin'] = {}
 
+# Cache for flattened field dictionaries (see get_all_known_fields)
+_known_fields_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+# Last GCS generation and parsed value per (bucket, path, parser); reloads
+# ask GCS to skip the download unless the object has changed
+_gcs_file_cache: Dict[tuple, tuple] = {}
+
+# Single-object plugin bundle: bundle key -> the plugin file it replaces
+BUNDLE_FILENAME = "bundle.json"
+BUNDLE_KEYS = {
+    "manifest": "manifest.json",
+    "fields": "fields.json",
+    "categories": "categories.json",
+    "validation": "validation.json",
+    "ml_recommendations": "ml_recommendations.json",
+    "bigquery": "bigquery.json",
+}
+
+# Field lookups remembered per plugin; keys come from the data, so bounded
+FIELD_LOOKUP_CACHE_SIZE = 16384
+
+# Array indices in field paths (mc[0] -> mc[])
+ARRAY_INDEX_PATTERN = re.compile(r'\[\d+\]')
+
+# Parsed plugin files keyed by (parser, SHA-256 of the file bytes), so a
+# reload of unchanged files skips JSON parsing and dataclass construction
+PARSE_CACHE_SIZE = 32
+_parse_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_parse_cache_lock = threading.Lock()  # Manifests are fetched from several threads
+
+# Concurrent manifest downloads when listing GCS plugins
+MANIFEST_DOWNLOAD_WORKERS = 8
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FieldDefinition:
     """Definition for a single field."""
     key: str
@@ -61,7 +107,7 @@ class FieldDefinition:
     default: Any = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Category:
     """Definition for a field category."""
     name: str
@@ -71,7 +117,7 @@ class Category:
     fields_pattern: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Plugin:
     """Complete plugin with all definitions."""
     plugin_id: str
@@ -86,10 +132,14 @@ class Plugin:
     ml_recommendations: Dict[str, Any] = field(default_factory=dict)
     bigquery_config: Dict[str, Any] = field(default_factory=dict)
     derived_features: Dict[str, Any] = field(default_factory=dict)
+    
+    # get_field_info results by field key (see FIELD_LOOKUP_CACHE_SIZE)
+    field_lookups: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False, compare=False)
 
 
+@lru_cache(maxsize=1)
 def get_storage_client():
-    """Get GCS storage client."""
+    """Get the process-wide GCS client, or None if it cannot be created (cached either way)."""
     try:
         return storage.Client()
     except Exception as e:
@@ -97,8 +147,33 @@ def get_storage_client():
         return None
 
 
-def load_json_from_gcs(bucket_name: str, blob_path: str) -> Optional[Dict]:
-    """Load JSON file from GCS."""
+def _parse_json(content: bytes, parser: Optional[Callable[[Dict], Any]] = None) -> Any:
+    """
+    Parse JSON bytes, then apply parser if given; cached by content hash.
+    
+    Results are shared between callers and must not be mutated.
+    """
+    key = (parser, hashlib.sha256(content).digest())
+    with _parse_cache_lock:
+        value = _parse_cache.get(key)
+        if value is not None:
+            _parse_cache.move_to_end(key)
+            return value
+    
+    value = orjson.loads(content)
+    if parser is not None:
+        value = parser(value)
+    
+    with _parse_cache_lock:
+        _parse_cache[key] = value
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return value
+
+
+def load_json_from_gcs(bucket_name: str, blob_path: str, parser: Optional[Callable[[Dict], Any]] = None,
+                       quiet: bool = False) -> Optional[Any]:
+    """Load JSON file from GCS (passed through parser if given; quiet: don't warn if missing)."""
     try:
         client = get_storage_client()
         if not client:
@@ -107,31 +182,45 @@ def load_json_from_gcs(bucket_name: str, blob_path: str) -> Optional[Dict]:
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(blob_path)
         
-        if blob.exists():
-            content = blob.download_as_text()
-            return json.loads(content)
+        cache_key = (bucket_name, blob_path, parser)
+        cached = _gcs_file_cache.get(cache_key)
+        if cached is None:
+            content = blob.download_as_bytes()
         else:
+            try:
+                content = blob.download_as_bytes(if_generation_not_match=cached[0])
+            except NotModified:
+                return cached[1]
+        
+        value = _parse_json(content, parser)
+        if blob.generation is not None:
+            _gcs_file_cache[cache_key] = (blob.generation, value)
+        return value
+    except NotFound:
+        _gcs_file_cache.pop((bucket_name, blob_path, parser), None)
+        if not quiet:
             logger.warning(f"Blob not found: gs://{bucket_name}/{blob_path}")
-            return None
+        return None
     except Exception as e:
         logger.error(f"Error loading from GCS: {e}")
         return None
 
 
-def load_json_from_local(file_path: str) -> Optional[Dict]:
-    """Load JSON file from local filesystem."""
+def load_json_from_local(file_path: str, parser: Optional[Callable[[Dict], Any]] = None) -> Optional[Any]:
+    """Load JSON file from local filesystem (passed through parser if given)."""
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
+        with open(file_path, 'rb') as f:
+            return _parse_json(f.read(), parser)
+    except FileNotFoundError:
         return None
     except Exception as e:
         logger.error(f"Error loading local file {file_path}: {e}")
         return None
 
 
+@lru_cache(maxsize=256)
 def find_local_plugin_file(plugin_id: str, filename: str) -> Optional[str]:
-    """Find a plugin file in any of the local plugin paths."""
+    """Find a plugin file in any of the local plugin paths (remembered until clear_plugin_cache)."""
     for base_path in LOCAL_PLUGIN_PATHS:
         file_path = os.path.join(base_path, plugin_id, filename)
         if os.path.exists(file_path):
@@ -139,11 +228,11 @@ def find_local_plugin_file(plugin_id: str, filename: str) -> Optional[str]:
     return None
 
 
-def load_plugin_file(plugin_id: str, filename: str) -> Optional[Dict]:
-    """Load a plugin file, trying GCS first then local paths."""
+def load_plugin_file(plugin_id: str, filename: str, parser: Optional[Callable[[Dict], Any]] = None) -> Optional[Any]:
+    """Load a plugin file (passed through parser if given), trying GCS first then local paths."""
     # Try GCS first
     gcs_path = f"{plugin_id}/{filename}"
-    data = load_json_from_gcs(PLUGINS_BUCKET, gcs_path)
+    data = load_json_from_gcs(PLUGINS_BUCKET, gcs_path, parser)
     
     if data:
         logger.info(f"Loaded {filename} from GCS for plugin {plugin_id}")
@@ -152,7 +241,7 @@ def load_plugin_file(plugin_id: str, filename: str) -> Optional[Dict]:
     # Fall back to local paths
     local_path = find_local_plugin_file(plugin_id, filename)
     if local_path:
-        data = load_json_from_local(local_path)
+        data = load_json_from_local(local_path, parser)
         if data:
             logger.info(f"Loaded {filename} from local ({local_path}) for plugin {plugin_id}")
             return data
@@ -161,6 +250,53 @@ def load_plugin_file(plugin_id: str, filename: str) -> Optional[Dict]:
     return None
 
 
+def _parse_bundle(bundle: Dict) -> Dict[str, Any]:
+    """Split a plugin bundle into its files, parsing fields and categories."""
+    return {
+        "manifest": bundle.get("manifest") or {},
+        "fields": parse_fields(bundle.get("fields") or {"fields": {}}),
+        "categories": parse_categories(bundle.get("categories") or {"categories": {}}),
+        "validation": bundle.get("validation") or {},
+        "ml_recommendations": bundle.get("ml_recommendations") or {},
+        "bigquery": bundle.get("bigquery") or {},
+    }
+
+
+def load_plugin_bundle(plugin_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a plugin's bundle.json, trying GCS first then local paths.
+    
+    Returns:
+        Dict of bundle key -> file contents (fields and categories parsed),
+        or None if the plugin has no bundle
+    """
+    bundle = load_json_from_gcs(PLUGINS_BUCKET, f"{plugin_id}/{BUNDLE_FILENAME}", _parse_bundle, quiet=True)
+    if bundle is not None:
+        logger.info(f"Loaded {BUNDLE_FILENAME} from GCS for plugin {plugin_id}")
+        return bundle
+    
+    local_path = find_local_plugin_file(plugin_id, BUNDLE_FILENAME)
+    if local_path:
+        bundle = load_json_from_local(local_path, _parse_bundle)
+        if bundle is not None:
+            logger.info(f"Loaded {BUNDLE_FILENAME} from local ({local_path}) for plugin {plugin_id}")
+    return bundle
+
+
+def bundle_plugin_files(plugin_id: str) -> bytes:
+    """
+    Build bundle.json content from a plugin's separate files.
+    
+    Upload the result as {plugin_id}/bundle.json (optionally stored with
+    Content-Encoding: gzip) so the plugin loads in one request.
+    """
+    bundle = {
+        key: load_plugin_file(plugin_id, filename) or {}
+        for key, filename in BUNDLE_KEYS.items()
+    }
+    return orjson.dumps(bundle, option=orjson.OPT_INDENT_2)
+
+
 def parse_fields(fields_data: Dict) -> Dict[str, FieldDefinition]:
     """Parse fields.json into FieldDefinition objects."""
     fields = {}
@@ -233,25 +369,33 @@ def load_plugin(plugin_id: str = None, force_reload: bool = False) -> Plugin:
     
     logger.info(f"Loading plugin: {plugin_id}")
     
-    # Load manifest
-    manifest = load_plugin_file(plugin_id, "manifest.json") or {}
-    
-    # Load fields
-    fields_data = load_plugin_file(plugin_id, "fields.json") or {"fields": {}}
-    fields = parse_fields(fields_data)
-    
-    # Load categories
-    categories_data = load_plugin_file(plugin_id, "categories.json") or {"categories": {}}
-    categories, category_priority = parse_categories(categories_data)
-    
-    # Load validation rules
-    validation_data = load_plugin_file(plugin_id, "validation.json") or {}
-    
-    # Load ML recommendations
-    ml_data = load_plugin_file(plugin_id, "ml_recommendations.json") or {}
-    
-    # Load BigQuery config
-    bq_data = load_plugin_file(plugin_id, "bigquery.json") or {}
+    bundle = load_plugin_bundle(plugin_id)
+    if bundle is not None:
+        # Everything in one object
+        manifest = bundle["manifest"]
+        fields = bundle["fields"]
+        categories, category_priority = bundle["categories"]
+        validation_data = bundle["validation"]
+        ml_data = bundle["ml_recommendations"]
+        bq_data = bundle["bigquery"]
+    else:
+        # Load manifest
+        manifest = load_plugin_file(plugin_id, "manifest.json") or {}
+        
+        # Load fields (parsed results are reused while the file is unchanged)
+        fields = load_plugin_file(plugin_id, "fields.json", parse_fields) or {}
+        
+        # Load categories
+        categories, category_priority = load_plugin_file(plugin_id, "categories.json", parse_categories) or ({}, [])
+        
+        # Load validation rules
+        validation_data = load_plugin_file(plugin_id, "validation.json") or {}
+        
+        # Load ML recommendations
+        ml_data = load_plugin_file(plugin_id, "ml_recommendations.json") or {}
+        
+        # Load BigQuery config
+        bq_data = load_plugin_file(plugin_id, "bigquery.json") or {}
     
     # Create plugin
     plugin = Plugin(
@@ -268,15 +412,21 @@ def load_plugin(plugin_id: str = None, force_reload: bool = False) -> Plugin:
         derived_features=ml_data.get("derived_features", {}),
     )
     
-    # Cache it
+    # Cache it (views derived from a previous load are now stale)
     _plugin_cache[plugin_id] = plugin
+    _known_fields_cache.pop(plugin_id, None)
     
     logger.info(f"Loaded plugin {plugin_id}: {len(fields)} fields, {len(categories)} categories")
     
     return plugin
 
 
-def get_field_info(field_key: str, plugin_id: str = None, context: str = None) -> Dict[str, Any]:
+def get_field_info(
+    field_key: str,
+    plugin_id: str = None,
+    context: str = None,
+    plugin: Optional[Plugin] = None
+) -> Dict[str, Any]:
     """
     Get information about a specific field.
     
@@ -284,12 +434,26 @@ def get_field_info(field_key: str, plugin_id: str = None, context: str = None) -
         field_key: Field name (e.g., 'ltp', 'batb', 'pt')
         plugin_id: Plugin to use
         context: Optional context (e.g., 'rc[]', 'marketDefinition')
+        plugin: Already-loaded plugin; skips the load_plugin lookup
+            (callers resolving many fields hoist it out of their loop)
     
     Returns:
-        Dictionary with field information
+        Dictionary with field information (shared, do not mutate)
     """
-    plugin = load_plugin(plugin_id)
+    if plugin is None:
+        plugin = load_plugin(plugin_id)
     
+    # Resolved once per key for each loaded plugin (a reload starts afresh)
+    info = plugin.field_lookups.get(field_key)
+    if info is None:
+        info = _lookup_field_info(plugin, field_key)
+        if len(plugin.field_lookups) < FIELD_LOOKUP_CACHE_SIZE:
+            plugin.field_lookups[field_key] = info
+    return info
+
+
+def _lookup_field_info(plugin: Plugin, field_key: str) -> Dict[str, Any]:
+    """Resolve a field key against a plugin's definitions."""
     # Try exact match first
     if field_key in plugin.fields:
         field_def = plugin.fields[field_key]
@@ -324,10 +488,13 @@ def get_field_info(field_key: str, plugin_id: str = None, context: str = None) -
             "original_path": field_key,
         }
     
-    # Check for array index patterns (mc[0], rc[1], etc.)
-    import re
-    cleaned_key = re.sub(r'\[\d+\]', '[]', field_key)
-    cleaned_base = cleaned_key.split('.')[-1].replace('[]', '')
+    # Check for array index patterns (mc[0], rc[1], etc.); without a bracket
+    # the cleaned key is the base key already tried
+    if '[' in field_key:
+        cleaned_key = ARRAY_INDEX_PATTERN.sub('[]', field_key)
+        cleaned_base = cleaned_key.split('.')[-1].replace('[]', '')
+    else:
+        cleaned_base = None
     
     if cleaned_base in plugin.fields:
         field_def = plugin.fields[cleaned_base]
@@ -353,10 +520,25 @@ def get_field_info(field_key: str, plugin_id: str = None, context: str = None) -
     }
 
 
-def get_category_for_field(field_key: str, plugin_id: str = None) -> str:
+def get_category_for_field(field_key: str, plugin_id: str = None, plugin: Optional[Plugin] = None) -> str:
     """Get the category name for a field."""
-    info = get_field_info(field_key, plugin_id)
-    return info.get("category", "Unknown")
+    if plugin is None:
+        plugin = load_plugin(plugin_id)
+    
+    # Reuse a resolved lookup if there is one; otherwise only the definition
+    # is needed, not a full info dict
+    info = plugin.field_lookups.get(field_key)
+    if info is not None:
+        return info.get("category", "Unknown")
+    
+    # Same keys _lookup_field_info tries, in the same order
+    field_def = plugin.fields.get(field_key)
+    if field_def is None:
+        field_def = plugin.fields.get(field_key.split('.')[-1].replace('[]', ''))
+    if field_def is None and '[' in field_key:
+        cleaned_key = ARRAY_INDEX_PATTERN.sub('[]', field_key)
+        field_def = plugin.fields.get(cleaned_key.split('.')[-1].replace('[]', ''))
+    return field_def.category if field_def is not None else "Unknown"
 
 
 def get_category_info(category_name: str, plugin_id: str = None) -> Dict[str, Any]:
@@ -380,9 +562,10 @@ def get_category_info(category_name: str, plugin_id: str = None) -> Dict[str, An
     }
 
 
-def get_all_categories(plugin_id: str = None) -> Dict[str, Dict[str, Any]]:
-    """Get all categories with their metadata."""
-    plugin = load_plugin(plugin_id)
+def get_all_categories(plugin_id: str = None, plugin: Optional[Plugin] = None) -> Dict[str, Dict[str, Any]]:
+    """Get all categories with their metadata (from plugin if already loaded)."""
+    if plugin is None:
+        plugin = load_plugin(plugin_id)
     
     result = {}
     for name, cat in plugin.categories.items():
@@ -429,18 +612,20 @@ def list_available_plugins() -> List[Dict[str, str]]:
     try:
         client = get_storage_client()
         if client:
-            bucket = client.bucket(PLUGINS_BUCKET)
-            blobs = bucket.list_blobs(delimiter='/')
+            # One listing finds every plugin directory's manifest
+            prefixes = sorted(
+                blob.name.split('/')[0]
+                for blob in client.list_blobs(PLUGINS_BUCKET, match_glob="*/manifest.json", fields="items(name),nextPageToken")
+            )
             
-            # Get prefixes (directories)
-            prefixes = set()
-            for blob in blobs:
-                if '/' in blob.name:
-                    prefix = blob.name.split('/')[0]
-                    prefixes.add(prefix)
+            # Then the manifests are fetched concurrently
+            with ThreadPoolExecutor(max_workers=MANIFEST_DOWNLOAD_WORKERS) as pool:
+                manifests = list(pool.map(
+                    lambda prefix: load_json_from_gcs(PLUGINS_BUCKET, f"{prefix}/manifest.json"),
+                    prefixes
+                ))
             
-            for prefix in prefixes:
-                manifest = load_json_from_gcs(PLUGINS_BUCKET, f"{prefix}/manifest.json")
+            for prefix, manifest in zip(prefixes, manifests):
                 if manifest:
                     plugin_id = manifest.get("plugin_id", prefix)
                     if plugin_id not in found_ids:
@@ -456,30 +641,52 @@ def list_available_plugins() -> List[Dict[str, str]]:
     
     # Check all local paths
     for local_path in LOCAL_PLUGIN_PATHS:
-        if os.path.exists(local_path):
-            for item in os.listdir(local_path):
-                item_path = os.path.join(local_path, item)
-                if os.path.isdir(item_path):
-                    manifest_path = os.path.join(item_path, "manifest.json")
-                    if os.path.exists(manifest_path):
-                        manifest = load_json_from_local(manifest_path)
-                        if manifest:
-                            plugin_id = manifest.get("plugin_id", item)
-                            if plugin_id not in found_ids:
-                                plugins.append({
-                                    "plugin_id": plugin_id,
-                                    "name": manifest.get("name", item),
-                                    "version": manifest.get("version", "unknown"),
-                                    "source": f"local:{local_path}",
-                                })
-                                found_ids.add(plugin_id)
+        try:
+            with os.scandir(local_path) as entries:
+                # DirEntry.is_dir() uses the type from the directory listing,
+                # so only the manifest open costs a filesystem call
+                plugin_dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            continue
+        
+        for entry in plugin_dirs:
+            manifest = load_json_from_local(os.path.join(entry.path, "manifest.json"))
+            if manifest:
+                plugin_id = manifest.get("plugin_id", entry.name)
+                if plugin_id not in found_ids:
+                    plugins.append({
+                        "plugin_id": plugin_id,
+                        "name": manifest.get("name", entry.name),
+                        "version": manifest.get("version", "unknown"),
+                        "source": f"local:{local_path}",
+                    })
+                    found_ids.add(plugin_id)
     
     return plugins
 
 
+def clear_plugin_cache():
+    """Drop all cached plugins so the next lookup reloads them from source."""
+    _plugin_cache.clear()
+    _known_fields_cache.clear()
+    find_local_plugin_file.cache_clear()
+
+
 # Convenience function for backward compatibility
 def get_all_known_fields(plugin_id: str = None) -> Dict[str, Dict[str, Any]]:
-    """Get all field definitions as a dictionary (backward compatible)."""
+    """
+    Get all field definitions as a dictionary (backward compatible).
+    
+    Built once per plugin and cached; the returned dict is shared and must
+    not be mutated.
+    """
+    if plugin_id is None:
+        plugin_id = DEFAULT_PLUGIN
+    
+    result = _known_fields_cache.get(plugin_id)
+    if result is not None:
+        return result
+    
     plugin = load_plugin(plugin_id)
     
     result = {}
@@ -492,4 +699,5 @@ def get_all_known_fields(plugin_id: str = None) -> Dict[str, Dict[str, Any]]:
             "ml_relevance": field_def.ml_relevance,
         }
     
+    _known_fields_cache[plugin_id] = result
     return result
@@ -0,0 +1,51 @@
+# queue_worker.py
+"""
+Analysis queue worker - runs API analysis jobs taken from the Redis queue
+
+Used when the API runs with CHIMERA_ANALYSIS_QUEUE=1 (and CHIMERA_REDIS_URL):
+/analyze then only enqueues jobs, and any number of these workers run them,
+reporting progress through the shared job store. Each worker runs up to
+CHIMERA_ANALYSIS_CONCURRENCY jobs at once.
+
+Run with: python queue_worker.py
+"""
+import asyncio
+
+from main import ANALYSIS_CONCURRENCY, job_store, run_analysis_task
+from job_store import RedisJobStore
+
+# Seconds each blocking dequeue waits before checking again
+DEQUEUE_TIMEOUT = 5
+
+
+async def consume(worker: int):
+    """Run queued analysis jobs one after another."""
+    while True:
+        try:
+            task = await job_store.dequeue(DEQUEUE_TIMEOUT)
+            if task is None:
+                continue
+            
+            print(f"[{worker}] Running {task['job_id']} ({task['bucket_url']})")
+            await run_analysis_task(**task)
+        except Exception as e:
+            # Keep consuming; run_analysis_task records job failures itself
+            print(f"[{worker}] Queue error: {e}")
+            await asyncio.sleep(1)
+
+
+async def run_workers():
+    """Run ANALYSIS_CONCURRENCY consumers until interrupted."""
+    await asyncio.gather(*(consume(worker) for worker in range(ANALYSIS_CONCURRENCY)))
+
+
+def main():
+    if not isinstance(job_store, RedisJobStore):
+        raise SystemExit("queue_worker needs a Redis job store: set CHIMERA_REDIS_URL")
+    
+    print(f"Waiting for analysis jobs ({ANALYSIS_CONCURRENCY} at a time)")
+    asyncio.run(run_workers())
+
+
+if __name__ == "__main__":
+    main()
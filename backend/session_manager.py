@@ -10,30 +10,147 @@ Each session stores:
 - Timestamps
 
 Sessions are stored in: gs://betfair-chimera-sessions/{session_id}.json
+Each file also carries its listing entry in custom metadata (LISTING_METADATA_KEY),
+so session listings are built from the bucket listing without downloading files.
 """
 
+import base64
+import gzip
 import json
-import uuid
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
+from google.cloud.storage.batch import Batch
 
 # Configuration
 SESSIONS_BUCKET = "betfair-chimera-sessions"
 
+# Sessions deleted per GCS batch request (GCS allows up to 100 calls per batch)
+DELETE_BATCH_SIZE = 100
+
+# Custom metadata key holding a session's listing entry (JSON)
+LISTING_METADATA_KEY = "listing"
+
+# Sessions without a listing entry (saved before listings were stored in
+# metadata) are read from the start only this far: their indented files put
+# the summary fields before analysis_result
+LEGACY_HEAD_BYTES = 64 * 1024
+_ANALYSIS_RESULT_KEY = b'\n  "analysis_result": '
+
+# Only the fields needed for a listing are requested from GCS
+_LIST_FIELDS = "items(name,timeCreated,metadata),nextPageToken"
+
+# Concurrent downloads when listing session summaries / exporting sessions
+LIST_DOWNLOAD_WORKERS = 16
+EXPORT_DOWNLOAD_WORKERS = 16
+
+# Seconds a session listing / session summary is served from memory.
+# Saves and deletes in this process invalidate them immediately; other API
+# workers may lag by up to the TTL.
+LIST_CACHE_TTL = 30
+SUMMARY_CACHE_TTL = 60
+SUMMARY_CACHE_SIZE = 512
+
+# Exports stay human-readable (indented); stored session files are compact
+_EXPORT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+_STORE_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Session files at least this large are stored gzip-encoded. GCS serves them
+# decompressed to download_as_bytes(), so readers need no changes.
+SESSION_GZIP_MIN_BYTES = 16 * 1024
+
+
+# Random hex for IDs is drawn from one os.urandom() block per 4 KB instead
+# of a urandom read per ID
+_ID_POOL_BYTES = 4096
+_id_pool = ""
+_id_pos = 0
+_id_lock = threading.Lock()
+
+
+def random_hex(length: int) -> str:
+    """Return `length` random hex characters (same entropy as uuid4().hex slices)."""
+    global _id_pool, _id_pos
+    with _id_lock:
+        if _id_pos + length > len(_id_pool):
+            _id_pool = os.urandom(_ID_POOL_BYTES).hex()
+            _id_pos = 0
+        start = _id_pos
+        _id_pos += length
+        return _id_pool[start:_id_pos]
+
 
 def generate_session_id() -> str:
     """Generate a unique session ID."""
     timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-    unique = uuid.uuid4().hex[:8]
+    unique = random_hex(8)
     return f"sess-{timestamp}-{unique}"
 
 
-def get_storage_client():
-    """Get GCS storage client."""
+class _TTLCache:
+    """Small LRU mapping whose entries expire `ttl` seconds after being set."""
+    
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+    
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+    
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key):
+        self._data.pop(key, None)
+    
+    def clear(self):
+        self._data.clear()
+
+
+# Listings keyed by (limit, start_after); summaries keyed by session ID
+_listing_cache = _TTLCache(LIST_CACHE_TTL, maxsize=32)
+_summary_cache = _TTLCache(SUMMARY_CACHE_TTL, maxsize=SUMMARY_CACHE_SIZE)
+
+
+def _invalidate(session_ids: List[str] = ()):
+    """Drop cached listings, and summaries of the given sessions."""
+    _listing_cache.clear()
+    for session_id in session_ids:
+        _summary_cache.pop(session_id)
+
+
+@lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """Return the process-wide GCS client (created on first use)."""
     return storage.Client()
 
 
+@lru_cache(maxsize=1)
+def get_sessions_bucket() -> storage.Bucket:
+    """Return the (cached) handle for the sessions bucket."""
+    return get_storage_client().bucket(SESSIONS_BUCKET)
+
+
 def ensure_bucket_exists():
     """Ensure the sessions bucket exists."""
     client = get_storage_client()
@@ -66,8 +183,7 @@ def save_session(
     Returns:
         Session summary object
     """
-    client = get_storage_client()
-    bucket = client.bucket(SESSIONS_BUCKET)
+    bucket = get_sessions_bucket()
     
     # Build session object
     session = {
@@ -87,23 +203,32 @@ def save_session(
         "ml_suggestions": analysis_result.get("ml_suggestions", []),
     }
     
+    # Summary (without full analysis) for listings and the response
+    listing = _listing_entry(session)
+    
     # Save to GCS
     blob = bucket.blob(f"{session_id}.json")
-    blob.upload_from_string(
-        json.dumps(session, indent=2, default=str),
-        content_type="application/json"
-    )
+    blob.metadata = {LISTING_METADATA_KEY: orjson.dumps(listing).decode()}
+    body = orjson.dumps(session, default=str, option=_STORE_OPTIONS)
+    if len(body) >= SESSION_GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=1)
+        blob.content_encoding = "gzip"
+    blob.upload_from_string(body, content_type="application/json")
     
     print(f"Session saved: {session_id}")
+    _invalidate([session_id])
     
-    # Return summary (without full analysis for response efficiency)
-    return {
-        "session_id": session_id,
-        "source_url": source_url,
-        "created_at": session["created_at"],
-        "status": session["status"],
-        "summary": session["summary"],
-    }
+    return listing
+
+
+def _loads_session(content: bytes) -> Dict:
+    """Parse a session file."""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # Sessions saved with the stdlib encoder may contain NaN/Infinity,
+        # which only the stdlib parser accepts
+        return json.loads(content)
 
 
 def get_session(session_id: str) -> Optional[Dict]:
@@ -116,63 +241,180 @@ def get_session(session_id: str) -> Optional[Dict]:
     Returns:
         Full session object or None if not found
     """
-    client = get_storage_client()
-    bucket = client.bucket(SESSIONS_BUCKET)
+    bucket = get_sessions_bucket()
     blob = bucket.blob(f"{session_id}.json")
     
+    # One request: a missing session is a 404 rather than an exists() check
     try:
-        if blob.exists():
-            content = blob.download_as_text()
-            return json.loads(content)
+        return _loads_session(blob.download_as_bytes())
+    except NotFound:
+        pass
     except Exception as e:
         print(f"Error loading session {session_id}: {e}")
     
     return None
 
 
-def list_sessions(limit: int = 50) -> List[Dict]:
+def _listing_entry(session: Dict) -> Dict:
+    """Reduce a session to the fields shown in listings."""
+    return {
+        "session_id": session.get("session_id"),
+        "source_url": session.get("source_url"),
+        "created_at": session.get("created_at"),
+        "status": session.get("status"),
+        "summary": session.get("summary", {}),
+    }
+
+
+def _load_session_summary(blob) -> Optional[Dict]:
+    """
+    Get one session's listing entry (None on error).
+    
+    Uses the entry stored in the blob's metadata. Sessions saved before
+    entries were stored there are read only up to their analysis_result.
+    """
+    listing = (blob.metadata or {}).get(LISTING_METADATA_KEY)
+    if listing:
+        try:
+            return orjson.loads(listing)
+        except orjson.JSONDecodeError:
+            pass
+    
+    try:
+        session = _load_session_head(blob)
+    except Exception as e:
+        print(f"Error parsing session {blob.name}: {e}")
+        return None
+    
+    return _listing_entry(session)
+
+
+def _load_session_head(blob) -> Dict:
     """
-    List all sessions (summaries only, not full analysis).
+    Parse a session file without its analysis_result where possible.
+    
+    Downloads the first LEGACY_HEAD_BYTES and closes the object just before
+    the top-level analysis_result key (only top-level keys sit at a two-space
+    indent). Falls back to the whole file if the summary is not in that range.
+    """
+    head = blob.download_as_bytes(start=0, end=LEGACY_HEAD_BYTES - 1)
+    cut = head.find(_ANALYSIS_RESULT_KEY)
+    if cut != -1:
+        session = _loads_session(head[:cut].rstrip(b",") + b"\n}")
+        if "summary" in session:
+            return session
+    elif len(head) < LEGACY_HEAD_BYTES:
+        return _loads_session(head)
+    return _loads_session(blob.download_as_bytes())
+
+
+def _sort_key(blob) -> Tuple[float, str]:
+    """Listing order key: newest first by upload time, then by name."""
+    return (blob.time_created.timestamp(), blob.name)
+
+
+def _encode_cursor(key: Tuple[float, str]) -> str:
+    return base64.urlsafe_b64encode(f"{key[0]!r}|{key[1]}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Parse a listing cursor (raises ValueError if malformed)."""
+    try:
+        timestamp, name = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return (float(timestamp), name)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def get_session_summary(session_id: str) -> Optional[Dict]:
+    """
+    Get a session's summary (without the full analysis), cached per session.
+    
+    Args:
+        session_id: Session identifier
+    
+    Returns:
+        Summary dict (shared, do not mutate) or None if not found
+    """
+    summary = _summary_cache.get(session_id)
+    if summary is not None:
+        return summary
+    
+    session = get_session(session_id)
+    if not session:
+        return None
+    
+    summary = {
+        "session_id": session["session_id"],
+        "source_url": session["source_url"],
+        "created_at": session["created_at"],
+        "status": session["status"],
+        "summary": session.get("summary", {}),
+        "schema_recommendations": session.get("schema_recommendations", {}),
+        "ml_suggestions": session.get("ml_suggestions", []),
+    }
+    _summary_cache.set(session_id, summary)
+    return summary
+
+
+def list_sessions(limit: int = 50, start_after: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    List sessions (summaries only, not full analysis), newest first.
     
     Args:
         limit: Maximum number of sessions to return
+        start_after: Cursor returned with the previous page, or None for the
+            first page
     
     Returns:
-        List of session summaries, newest first
+        (session summaries, cursor for the next page or None if this is the
+        last page). Cached for LIST_CACHE_TTL; shared, do not mutate.
+    
+    Raises:
+        ValueError: If start_after is not a valid cursor
     """
+    cache_key = (limit, start_after)
+    cached = _listing_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    after = _decode_cursor(start_after) if start_after else None
+    
     client = get_storage_client()
-    bucket = client.bucket(SESSIONS_BUCKET)
     
     sessions = []
+    next_cursor = None
     
     try:
-        blobs = list(bucket.list_blobs(max_results=limit * 2))  # Get extra for filtering
+        # GCS lists by name only, so order the (metadata-only) listing here
+        blobs = sorted(
+            (
+                blob for blob in client.list_blobs(SESSIONS_BUCKET, fields=_LIST_FIELDS)
+                if blob.name.endswith('.json')
+            ),
+            key=_sort_key,
+            reverse=True
+        )
+        if after is not None:
+            blobs = [blob for blob in blobs if _sort_key(blob) < after]
         
-        for blob in blobs:
-            if blob.name.endswith('.json'):
-                try:
-                    content = blob.download_as_text()
-                    session = json.loads(content)
-                    
-                    # Return summary only
-                    sessions.append({
-                        "session_id": session.get("session_id"),
-                        "source_url": session.get("source_url"),
-                        "created_at": session.get("created_at"),
-                        "status": session.get("status"),
-                        "summary": session.get("summary", {}),
-                    })
-                except Exception as e:
-                    print(f"Error parsing session {blob.name}: {e}")
-                    continue
+        if len(blobs) > limit:
+            next_cursor = _encode_cursor(_sort_key(blobs[limit - 1]))
+            blobs = blobs[:limit]
         
-        # Sort by created_at descending (newest first)
-        sessions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        # Older sessions without a listing entry in their metadata need a
+        # download, so fetch those concurrently
+        with ThreadPoolExecutor(max_workers=LIST_DOWNLOAD_WORKERS) as pool:
+            for session in pool.map(_load_session_summary, blobs):
+                if session is not None:
+                    sessions.append(session)
         
     except Exception as e:
         print(f"Error listing sessions: {e}")
+        return sessions, None
     
-    return sessions[:limit]
+    _listing_cache.set(cache_key, (sessions, next_cursor))
+    return sessions, next_cursor
 
 
 def delete_session(session_id: str) -> bool:
@@ -185,21 +427,31 @@ def delete_session(session_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    client = get_storage_client()
-    bucket = client.bucket(SESSIONS_BUCKET)
+    bucket = get_sessions_bucket()
     blob = bucket.blob(f"{session_id}.json")
     
     try:
-        if blob.exists():
-            blob.delete()
-            print(f"Session deleted: {session_id}")
-            return True
+        blob.delete()
+        print(f"Session deleted: {session_id}")
+        _invalidate([session_id])
+        return True
+    except NotFound:
+        pass
     except Exception as e:
         print(f"Error deleting session {session_id}: {e}")
     
     return False
 
 
+class _DeleteBatch(Batch):
+    """GCS batch that keeps the per-call responses returned by finish()."""
+    
+    def finish(self, raise_exception=True):
+        # Leaving the with block sends the batch through here
+        self.responses = super().finish(raise_exception=raise_exception)
+        return self.responses
+
+
 def delete_sessions(session_ids: List[str]) -> Dict:
     """
     Delete multiple sessions.
@@ -210,14 +462,34 @@ def delete_sessions(session_ids: List[str]) -> Dict:
     Returns:
         Result summary
     """
+    client = get_storage_client()
+    bucket = get_sessions_bucket()
+    
     deleted = []
     failed = []
     
-    for session_id in session_ids:
-        if delete_session(session_id):
-            deleted.append(session_id)
-        else:
-            failed.append(session_id)
+    # Deletes are grouped into batch requests, one HTTP round trip per
+    # DELETE_BATCH_SIZE sessions; missing sessions come back as 404s
+    for start in range(0, len(session_ids), DELETE_BATCH_SIZE):
+        chunk = session_ids[start:start + DELETE_BATCH_SIZE]
+        try:
+            with _DeleteBatch(client, raise_exception=False) as batch:
+                for session_id in chunk:
+                    bucket.blob(f"{session_id}.json").delete()
+            statuses = [response.status_code for response in batch.responses]
+        except Exception as e:
+            print(f"Error deleting sessions: {e}")
+            failed.extend(chunk)
+            continue
+        
+        for session_id, status in zip(chunk, statuses):
+            if 200 <= status < 300:
+                print(f"Session deleted: {session_id}")
+                deleted.append(session_id)
+            else:
+                failed.append(session_id)
+    
+    _invalidate(deleted)
     
     return {
         "deleted": deleted,
@@ -236,7 +508,28 @@ def export_session(session_id: str, format: str = "json") -> Optional[str]:
         format: Export format ('json' or 'summary')
     
     Returns:
-        Formatted export string or None if not found
+        Formatted JSON string or None if not found
+    """
+    chunks = export_session_iter(session_id, format)
+    if chunks is None:
+        return None
+    return b"".join(chunks).decode()
+
+
+def export_session_iter(session_id: str, format: str = "json") -> Optional[Iterator[bytes]]:
+    """
+    Export a session in the specified format as a stream of JSON chunks.
+    
+    The session is fetched up front (so a missing session can be reported
+    before anything is sent); encoding then happens one top-level key at a
+    time, so the full serialized document is never held in memory.
+    
+    Args:
+        session_id: Session identifier
+        format: Export format ('json' or 'summary')
+    
+    Returns:
+        Iterator of UTF-8 JSON chunks, or None if not found
     """
     session = get_session(session_id)
     
@@ -245,17 +538,81 @@ def export_session(session_id: str, format: str = "json") -> Optional[str]:
     
     if format == "summary":
         # Return condensed summary
-        return json.dumps({
+        session = {
             "session_id": session["session_id"],
             "source_url": session["source_url"],
             "created_at": session["created_at"],
             "summary": session["summary"],
             "schema_recommendations": session.get("schema_recommendations", {}),
             "ml_suggestions": session.get("ml_suggestions", []),
-        }, indent=2, default=str)
-    else:
-        # Full JSON export
-        return json.dumps(session, indent=2, default=str)
+        }
+    
+    return _iter_json_object(session)
+
+
+def _iter_json_object(obj: Dict) -> Iterator[bytes]:
+    """
+    Encode a dict one top-level entry at a time.
+    
+    The chunks join to exactly orjson.dumps(obj) with _EXPORT_OPTIONS: each
+    value is encoded indented and shifted one level right (JSON strings
+    cannot contain raw newlines, so every newline is structural).
+    """
+    if not obj:
+        yield b"{}"
+        return
+    
+    separator = b"{\n  "
+    for key, value in obj.items():
+        encoded = orjson.dumps(value, default=str, option=_EXPORT_OPTIONS).replace(b"\n", b"\n  ")
+        yield separator + orjson.dumps(str(key)) + b": " + encoded
+        separator = b",\n  "
+    yield b"\n}"
+
+
+def export_sessions_iter(session_ids: List[str], format: str = "json") -> Iterator[bytes]:
+    """
+    Export multiple sessions as a JSON array, one chunk per session.
+    
+    Sessions are downloaded in parallel (at most EXPORT_DOWNLOAD_WORKERS at
+    a time) but encoded and yielded one at a time in the order requested, so
+    memory stays bounded however many are exported. Missing sessions are
+    skipped.
+    
+    Args:
+        session_ids: List of session identifiers
+        format: Export format
+    
+    Yields:
+        UTF-8 JSON chunks that together form the array
+    """
+    yield b"["
+    separator = b"\n"
+    
+    with ThreadPoolExecutor(max_workers=EXPORT_DOWNLOAD_WORKERS) as pool:
+        # Keep up to EXPORT_DOWNLOAD_WORKERS downloads running ahead of the
+        # one being sent; results are consumed in request order
+        ids = iter(session_ids)
+        pending = deque(pool.submit(get_session, sid) for sid in islice(ids, EXPORT_DOWNLOAD_WORKERS))
+        
+        while pending:
+            session = pending.popleft().result()
+            for session_id in islice(ids, 1):
+                pending.append(pool.submit(get_session, session_id))
+            
+            if session:
+                if format == "summary":
+                    session = {
+                        "session_id": session["session_id"],
+                        "source_url": session["source_url"],
+                        "created_at": session["created_at"],
+                        "summary": session["summary"],
+                        "schema_recommendations": session.get("schema_recommendations", {}),
+                    }
+                yield separator + orjson.dumps(session, default=str, option=_EXPORT_OPTIONS)
+                separator = b",\n"
+    
+    yield b"\n]"
 
 
 def export_sessions(session_ids: List[str], format: str = "json") -> str:
@@ -269,23 +626,7 @@ def export_sessions(session_ids: List[str], format: str = "json") -> str:
     Returns:
         JSON array of sessions
     """
-    sessions = []
-    
-    for session_id in session_ids:
-        session = get_session(session_id)
-        if session:
-            if format == "summary":
-                sessions.append({
-                    "session_id": session["session_id"],
-                    "source_url": session["source_url"],
-                    "created_at": session["created_at"],
-                    "summary": session["summary"],
-                    "schema_recommendations": session.get("schema_recommendations", {}),
-                })
-            else:
-                sessions.append(session)
-    
-    return json.dumps(sessions, indent=2, default=str)
+    return b"".join(export_sessions_iter(session_ids, format)).decode()
 
 
 def get_session_for_bigquery(session_id: str) -> Optional[Dict]:
@@ -3,9 +3,14 @@
 Cloud Batch worker - runs the heavy analysis on a big machine
 """
 import argparse
-import json
+import os
+import orjson
 from google.cloud import storage
-from analyzer import analyze_records
+from analyzer import analyze_records, parse_gcs_url
+
+# Results are uploaded in chunks of this size (a multiple of 256 KB)
+RESULT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+_RESULT_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
 
 def load_manifest(gcs_path: str) -> dict:
@@ -18,19 +23,13 @@ def load_manifest(gcs_path: str) -> dict:
     Returns:
         Parsed manifest dict
     """
-    assert gcs_path.startswith("gs://"), f"Invalid GCS path: {gcs_path}"
-
-    # Parse gs://bucket/path/to/file.json
-    path_without_prefix = gcs_path.replace("gs://", "")
-    parts = path_without_prefix.split("/", 1)
-    bucket_name = parts[0]
-    blob_name = parts[1] if len(parts) > 1 else ""
+    bucket_name, blob_name = parse_gcs_url(gcs_path)
 
     client = storage.Client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(blob_name)
 
-    return json.loads(blob.download_as_text())
+    return orjson.loads(blob.download_as_bytes())
 
 
 def save_results(results: dict, output_prefix: str, job_id: str):
@@ -42,26 +41,22 @@ def save_results(results: dict, output_prefix: str, job_id: str):
         output_prefix: GCS prefix for output (gs://bucket/path/)
         job_id: Job ID for the filename
     """
-    # Parse output prefix
-    path_without_prefix = output_prefix.replace("gs://", "")
-    parts = path_without_prefix.split("/", 1)
-    bucket_name = parts[0]
-    blob_prefix = parts[1] if len(parts) > 1 else ""
-
-    # Ensure prefix ends with /
-    if blob_prefix and not blob_prefix.endswith("/"):
-        blob_prefix += "/"
-
-    output_path = f"{blob_prefix}analysis_result.json"
+    bucket_name, blob_prefix = parse_gcs_url(output_prefix)
+    output_path = f"{blob_prefix}/analysis_result.json" if blob_prefix else "analysis_result.json"
 
     client = storage.Client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(output_path)
 
-    blob.upload_from_string(
-        json.dumps(results, indent=2, default=str),
-        content_type="application/json"
-    )
+    # Upload resumably in RESULT_UPLOAD_CHUNK_SIZE pieces, encoding one
+    # top-level entry at a time, so the full JSON is never held in memory
+    with blob.open("wb", content_type="application/json", chunk_size=RESULT_UPLOAD_CHUNK_SIZE) as f:
+        separator = b"{"
+        for key, value in results.items():
+            f.write(separator + orjson.dumps(str(key)) + b":")
+            f.write(orjson.dumps(value, default=str, option=_RESULT_OPTIONS))
+            separator = b","
+        f.write(b"}" if separator == b"," else b"{}")
 
     print(f"Results saved to gs://{bucket_name}/{output_path}")
 
@@ -83,7 +78,9 @@ def main():
     print(f"Output prefix: {output_prefix}")
 
     print("Starting analysis...")
-    results = analyze_records(bucket_url=bucket_url)
+    # Batch machines are sized for this job, so shard field discovery
+    # across every available core
+    results = analyze_records(bucket_url=bucket_url, workers=os.cpu_count() or 1)
 
     print("Saving results...")
     save_results(results, output_prefix, job_id)